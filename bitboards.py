@@ -0,0 +1,267 @@
+"""
+Created on Sun Oct 18 19:05:48 2026
+
+@author: danielb
+"""
+
+from helpful_functions import square_to_index
+
+WHITE = 'White'
+BLACK = 'Black'
+BISHOP = 'Bishop'
+KING = 'King'
+KNIGHT = 'Knight'
+PAWN = 'Pawn'
+QUEEN = 'Queen'
+ROOK = 'Rook'
+
+# Pieces a pawn can be promoted to, best first
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+# Bit 0 is square 1a, bit 7 is square 1h and bit 63 is square 8h, the same
+# as the square indexes
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+FILE_A = 0x0101010101010101
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+FILE_H = FILE_A << 7
+ROW_1 = 0xFF
+ROW_3 = ROW_1 << 16
+ROW_6 = ROW_1 << 40
+ROW_8 = ROW_1 << 56
+# A pawn reaching either end row promotes
+PROMOTION_ROWS = ROW_1 | ROW_8
+NOT_FILE_A = FULL_BOARD ^ FILE_A
+NOT_FILE_H = FULL_BOARD ^ FILE_H
+NOT_FILES_AB = FULL_BOARD ^ (FILE_A | FILE_B)
+NOT_FILES_GH = FULL_BOARD ^ (FILE_G | FILE_H)
+
+# Row and column steps for each sliding direction. The first four directions
+# go towards higher square indexes and the last four towards lower ones
+NORTH = 0
+EAST = 1
+NORTH_EAST = 2
+NORTH_WEST = 3
+SOUTH = 4
+WEST = 5
+SOUTH_WEST = 6
+SOUTH_EAST = 7
+DIRECTION_STEPS = ((1, 0), (0, 1), (1, 1), (1, -1),
+                   (-1, 0), (0, -1), (-1, -1), (-1, 1))
+ROOK_DIRECTIONS = (NORTH, EAST, SOUTH, WEST)
+BISHOP_DIRECTIONS = (NORTH_EAST, NORTH_WEST, SOUTH_WEST, SOUTH_EAST)
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+# Squares that have to be empty for each castle and the rook's square
+CASTLING_PATHS = {
+    WHITE: ((square_to_index('1g'), square_to_index('1h'),
+             (1 << square_to_index('1f')) | (1 << square_to_index('1g'))),
+            (square_to_index('1c'), square_to_index('1a'),
+             (1 << square_to_index('1b')) | (1 << square_to_index('1c')) |
+             (1 << square_to_index('1d')))),
+    BLACK: ((square_to_index('8g'), square_to_index('8h'),
+             (1 << square_to_index('8f')) | (1 << square_to_index('8g'))),
+            (square_to_index('8c'), square_to_index('8a'),
+             (1 << square_to_index('8b')) | (1 << square_to_index('8c')) |
+             (1 << square_to_index('8d'))))
+    }
+
+
+def square_indexes(bitboard):
+    """Returns the indexes of all the squares set in the bitboard"""
+    indexes = []
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        indexes.append(lowest_bit.bit_length() - 1)
+        bitboard ^= lowest_bit
+    return indexes
+
+
+def knight_attacks(bitboard):
+    """Returns the squares attacked by the knights in the bitboard"""
+    one_left = (bitboard >> 1) & NOT_FILE_H
+    two_left = (bitboard >> 2) & NOT_FILES_GH
+    one_right = (bitboard << 1) & NOT_FILE_A
+    two_right = (bitboard << 2) & NOT_FILES_AB
+    one_over = one_left | one_right
+    two_over = two_left | two_right
+    return ((one_over << 16) | (one_over >> 16) |
+            (two_over << 8) | (two_over >> 8)) & FULL_BOARD
+
+
+def king_attacks(bitboard):
+    """Returns the squares attacked by the kings in the bitboard"""
+    attacks = ((bitboard << 1) & NOT_FILE_A) | ((bitboard >> 1) & NOT_FILE_H)
+    row = bitboard | attacks
+    return (attacks | (row << 8) | (row >> 8)) & FULL_BOARD
+
+
+def pawn_attacks(bitboard, color):
+    """Returns the squares attacked by the pawns of the passed color"""
+    if color == WHITE:
+        return (((bitboard << 7) & NOT_FILE_H) |
+                ((bitboard << 9) & NOT_FILE_A)) & FULL_BOARD
+    return ((bitboard >> 9) & NOT_FILE_H) | ((bitboard >> 7) & NOT_FILE_A)
+
+
+# Attack tables for every square, worked out once when the module is loaded
+KNIGHT_ATTACKS = tuple(knight_attacks(1 << square) for square in range(64))
+KING_ATTACKS = tuple(king_attacks(1 << square) for square in range(64))
+PAWN_ATTACKS = {
+    color: tuple(pawn_attacks(1 << square, color) for square in range(64))
+    for color in (WHITE, BLACK)
+    }
+PAWN_PUSHES = {
+    WHITE: tuple(((1 << square) << 8) & FULL_BOARD for square in range(64)),
+    BLACK: tuple((1 << square) >> 8 for square in range(64))
+    }
+# The rows a pawn lands on with its first push from its starting row
+DOUBLE_PUSH_ROWS = {WHITE: ROW_3, BLACK: ROW_6}
+
+# The same tables as lists of square indexes for walking through the moves
+KNIGHT_SQUARES = tuple(tuple(square_indexes(attacks))
+                       for attacks in KNIGHT_ATTACKS)
+KING_SQUARES = tuple(tuple(square_indexes(attacks))
+                     for attacks in KING_ATTACKS)
+PAWN_ATTACK_SQUARES = {
+    color: tuple(tuple(square_indexes(attacks)) for attacks in table)
+    for color, table in PAWN_ATTACKS.items()
+    }
+
+
+def _ray_squares(square, direction):
+    """Returns the squares from the passed square to the edge of the board
+    in one direction, nearest first"""
+    row_step, column_step = DIRECTION_STEPS[direction]
+    row = (square >> 3) + row_step
+    column = (square & 7) + column_step
+    squares = []
+    while 0 <= row < 8 and 0 <= column < 8:
+        squares.append(row*8 + column)
+        row += row_step
+        column += column_step
+    return tuple(squares)
+
+
+# Ray tables with the squares in each direction from every square, both as
+# ordered square lists and as bitboards
+RAY_SQUARES = tuple(tuple(_ray_squares(square, direction)
+                          for square in range(64))
+                    for direction in range(len(DIRECTION_STEPS)))
+RAYS = tuple(tuple(sum(1 << ray_square for ray_square in ray)
+                   for ray in direction_rays)
+             for direction_rays in RAY_SQUARES)
+POSITIVE_ROOK_RAYS = (RAYS[NORTH], RAYS[EAST])
+NEGATIVE_ROOK_RAYS = (RAYS[SOUTH], RAYS[WEST])
+POSITIVE_BISHOP_RAYS = (RAYS[NORTH_EAST], RAYS[NORTH_WEST])
+NEGATIVE_BISHOP_RAYS = (RAYS[SOUTH_WEST], RAYS[SOUTH_EAST])
+POSITIVE_QUEEN_RAYS = POSITIVE_ROOK_RAYS + POSITIVE_BISHOP_RAYS
+NEGATIVE_QUEEN_RAYS = NEGATIVE_ROOK_RAYS + NEGATIVE_BISHOP_RAYS
+
+
+def _ray_attacks(square, occupied, positive_rays, negative_rays):
+    """Returns the squares attacked along the passed rays. Each ray is cut
+    off behind its first blocker, which is the lowest set bit for rays going
+    up the board and the highest set bit for rays going down"""
+    attacks = 0
+    for rays in positive_rays:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in negative_rays:
+        ray = rays[square]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square, occupied):
+    """Returns the squares attacked by a rook on the passed square"""
+    return _ray_attacks(square, occupied,
+                        POSITIVE_ROOK_RAYS, NEGATIVE_ROOK_RAYS)
+
+
+def bishop_attacks(square, occupied):
+    """Returns the squares attacked by a bishop on the passed square"""
+    return _ray_attacks(square, occupied,
+                        POSITIVE_BISHOP_RAYS, NEGATIVE_BISHOP_RAYS)
+
+
+class BitboardMoveGenerator():
+    """Move generator that works out each piece's targets set-wise from the
+    64 bit integer bitboards with shifts and masks instead of walking the
+    board square by square. add_moves hands the target bitboard straight to
+    the board to turn into moves, which is the fast path used for the legal
+    moves and captures, and check_potential_moves fills in the same lists as
+    the pieces' own check_potential_moves"""
+    def return_targets(self, board, piece):
+        """Returns a bitboard of the squares the piece can move or capture
+        to, leaving out castles and en passant"""
+        occupancy = board.occupancy
+        color = piece.color
+        square = piece.position
+        piece_type = piece.piece_type
+        own = occupancy[color]
+        occupied = occupancy[WHITE] | occupancy[BLACK]
+        if piece_type == PAWN:
+            empty = ~occupied
+            pushes = PAWN_PUSHES[color][square] & empty
+            # A pawn on its starting row can push a second square if the
+            # first one was free
+            if pushes & DOUBLE_PUSH_ROWS[color]:
+                pushes |= PAWN_PUSHES[color][pushes.bit_length() - 1] & empty
+            return pushes | (PAWN_ATTACKS[color][square] & (occupied ^ own))
+        if piece_type == KNIGHT:
+            attacks = KNIGHT_ATTACKS[square]
+        elif piece_type == KING:
+            attacks = KING_ATTACKS[square]
+        elif piece_type == ROOK:
+            attacks = rook_attacks(square, occupied)
+        elif piece_type == BISHOP:
+            attacks = bishop_attacks(square, occupied)
+        else:
+            attacks = _ray_attacks(square, occupied, POSITIVE_QUEEN_RAYS,
+                                   NEGATIVE_QUEEN_RAYS)
+        return attacks & ~own
+
+    def add_moves(self, board, piece, moves, allowed_squares=FULL_BOARD,
+                  promotion_types=PROMOTION_TYPES):
+        """Adds the piece's moves and captures onto the allowed squares to
+        the list, once for each of the promotion types if it promotes.
+        Castles and en passant are left to the board"""
+        board.add_target_moves(moves, piece,
+                               self.return_targets(board, piece) &
+                               allowed_squares, promotion_types)
+
+    def check_potential_moves(self, board, piece):
+        """Fills in the potential moves, captures and special moves of the
+        passed piece for the board's current position"""
+        targets = self.return_targets(board, piece)
+        captures = targets & board.occupancy[BLACK if piece.color == WHITE
+                                             else WHITE]
+        piece.possible_moves[:] = square_indexes(targets ^ captures)
+        piece.possible_captures[:] = square_indexes(captures)
+        piece.possible_special_moves.clear()
+        if piece.piece_type == PAWN:
+            en_passant_square = board.en_passant_square
+            if en_passant_square is not None and \
+                    PAWN_ATTACKS[piece.color][piece.position] >> \
+                    en_passant_square & 1:
+                piece.possible_special_moves.append(en_passant_square)
+        elif piece.piece_type == KING and not piece.has_been_moved:
+            self._castling_moves(board, piece, board.occupancy[WHITE] |
+                                 board.occupancy[BLACK])
+
+    @staticmethod
+    def _castling_moves(board, piece, occupied):
+        """Adds the castle moves for an unmoved king"""
+        for king_target, rook_square, path in CASTLING_PATHS[piece.color]:
+            rook_piece = board.return_piece(rook_square)
+            if rook_piece is None or rook_piece.has_been_moved:
+                continue
+            if not occupied & path:
+                piece.possible_special_moves.append(king_target)
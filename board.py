@@ -0,0 +1,860 @@
+"""
+Created on Sun Oct 18 18:02:11 2026
+
+@author: danielb
+"""
+
+import logging
+from collections import namedtuple
+from bitboards import BISHOP_DIRECTIONS, FULL_BOARD, KING_ATTACKS, \
+    KNIGHT_ATTACKS, PAWN_ATTACKS, PROMOTION_ROWS, RAY_SQUARES, RAYS, \
+    ROOK_DIRECTIONS, BitboardMoveGenerator, bishop_attacks, rook_attacks
+from chess_pieces import Bishop, King, Knight, Pawn, Queen, Rook
+from evaluation import ENDGAME_SQUARE_SCORES, MIDDLEGAME_SQUARE_SCORES, \
+    PHASE_WEIGHTS
+from helpful_dictionaries import fen_letters, fen_piece_types
+from helpful_functions import algebraic_to_index, index_to_algebraic, \
+    index_to_square, square_to_index
+from zobrist import BLACK_TO_MOVE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS, \
+    PIECE_KEYS
+
+WHITE = 'White'
+BLACK = 'Black'
+BISHOP = 'Bishop'
+KING = 'King'
+KNIGHT = 'Knight'
+PAWN = 'Pawn'
+QUEEN = 'Queen'
+ROOK = 'Rook'
+BOARD_SIZE = 8
+
+# Castling rights are stored as bit flags
+WHITE_KING_SIDE = 1
+WHITE_QUEEN_SIDE = 2
+BLACK_KING_SIDE = 4
+BLACK_QUEEN_SIDE = 8
+ALL_CASTLING_RIGHTS = 15
+CASTLING_LETTERS = (('K', WHITE_KING_SIDE), ('Q', WHITE_QUEEN_SIDE),
+                    ('k', BLACK_KING_SIDE), ('q', BLACK_QUEEN_SIDE))
+
+# How a game can end besides a king being captured
+CHECKMATE = 'Checkmate'
+STALEMATE = 'Stalemate'
+THREEFOLD_REPETITION = 'Threefold repetition'
+FIFTY_MOVE_RULE = 'Fifty-move rule'
+# Half moves without a capture or pawn move before the game is drawn
+FIFTY_MOVE_LIMIT = 100
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+# Castling rights lost when a piece moves from (or is captured on) a square
+CASTLING_RIGHTS_LOST = [0]*64
+CASTLING_RIGHTS_LOST[square_to_index('1e')] = WHITE_KING_SIDE | \
+    WHITE_QUEEN_SIDE
+CASTLING_RIGHTS_LOST[square_to_index('1h')] = WHITE_KING_SIDE
+CASTLING_RIGHTS_LOST[square_to_index('1a')] = WHITE_QUEEN_SIDE
+CASTLING_RIGHTS_LOST[square_to_index('8e')] = BLACK_KING_SIDE | \
+    BLACK_QUEEN_SIDE
+CASTLING_RIGHTS_LOST[square_to_index('8h')] = BLACK_KING_SIDE
+CASTLING_RIGHTS_LOST[square_to_index('8a')] = BLACK_QUEEN_SIDE
+
+# Pieces a pawn can be promoted to, best first
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+# A move from one square index to another with the promotion piece type (or
+# None). Castles and en passants are recognised from the squares alone
+Move = namedtuple('Move', 'start end promotion', defaults=(None,))
+# Every move without a promotion built once up front, indexed by the start
+# and end squares, as making namedtuples is slow and moves never change
+MOVES = tuple(tuple(Move(start, end) for end in range(64))
+              for start in range(64))
+
+# Everything make_move changes that unmake_move can't work out from the move
+UndoRecord = namedtuple('UndoRecord', 'move piece captured_piece '
+                        'promoted_piece castling_rights en_passant_square '
+                        'has_been_moved zobrist_key halfmove_clock')
+
+PIECE_CLASSES = {
+    BISHOP: Bishop,
+    KING: King,
+    KNIGHT: Knight,
+    PAWN: Pawn,
+    QUEEN: Queen,
+    ROOK: Rook
+    }
+
+
+class PieceMoveGenerator():
+    """Move generator that uses each piece's own check_potential_moves"""
+    def check_potential_moves(self, board, piece):
+        """Fills in the potential moves, captures and special moves of the
+        passed piece for the board's current position"""
+        piece.check_potential_moves(board.return_squares(),
+                                    board.en_passant_square)
+
+    def add_moves(self, board, piece, moves, allowed_squares=FULL_BOARD,
+                  promotion_types=PROMOTION_TYPES):
+        """Adds the piece's moves and captures onto the allowed squares to
+        the list, once for each of the promotion types if it promotes.
+        Castles and en passant are left to the board"""
+        self.check_potential_moves(board, piece)
+        start = piece.position
+        for move_list in (piece.possible_captures, piece.possible_moves):
+            for end in move_list:
+                if not (1 << end) & allowed_squares:
+                    continue
+                if board.is_promotion_move(piece, end):
+                    for piece_type in promotion_types:
+                        moves.append(Move(start, end, piece_type))
+                else:
+                    moves.append(MOVES[start][end])
+
+
+class Board():
+    """Class that holds a chess position (pieces, side to move, castling
+    rights and en passant square) without depending on any display. Squares
+    are indexes from 0 (1a) to 63 (8h) and are only turned into names for
+    displaying and logging. Moves come from the bitboard move generator
+    unless it is swapped out for any object with the same
+    check_potential_moves(board, piece) and add_moves(board, piece, moves,
+    allowed_squares, promotion_types) methods"""
+    def __init__(self, move_generator=None, fen=STARTING_FEN):
+        # Instance variables
+        if move_generator is None:
+            move_generator = BitboardMoveGenerator()
+        self.move_generator = move_generator
+        self.pieces = []
+        self.squares = [None]*64
+        self.occupancy = {WHITE: 0, BLACK: 0}
+        self.piece_lists = {color: {piece_type: []
+                                    for piece_type in PIECE_CLASSES}
+                            for color in (WHITE, BLACK)}
+        self.piece_bitboards = {color: dict.fromkeys(PIECE_CLASSES, 0)
+                                for color in (WHITE, BLACK)}
+        self.turn_color = WHITE
+        self.castling_rights = ALL_CASTLING_RIGHTS
+        self.en_passant_square = None
+        self.zobrist_key = 0
+        # Zobrist keys of every position reached since the board was set up
+        # (the current one last), for spotting repetitions
+        self.key_history = []
+        # Half moves since the last capture or pawn move and the number of
+        # the full move being played
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        # Zobrist key of just the pawns for the pawn hash table
+        self.pawn_key = 0
+        # Running evaluation totals from white's side and the game phase
+        self.middlegame_score = 0
+        self.endgame_score = 0
+        self.phase = 0
+        self.move_history = []
+        # Promoted pieces taken back by unmake_move, kept per color and type
+        # to be reused by the next promotion instead of building new ones
+        self._promotion_pool = {color: {piece_type: []
+                                        for piece_type in PROMOTION_TYPES}
+                                for color in (WHITE, BLACK)}
+        # Legal moves of the side to move and the zobrist key of the
+        # position they were worked out for (None once a move is made)
+        self._legal_moves = ()
+        self._legal_moves_key = None
+        self.in_check = False
+        self.winner = None
+        self.result = None
+        # Initialization methods
+        self.set_fen(fen)
+
+    def set_fen(self, fen):
+        """Sets the board up from a position in Forsyth-Edwards Notation"""
+        for piece in list(self.pieces):
+            self._remove_piece(piece)
+        self.move_history.clear()
+        self._legal_moves_key = None
+        self.winner = None
+        self.result = None
+        fields = fen.split()
+        placement, turn, castling, en_passant = fields[:4]
+        self.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+
+        # The placement lists the rows from the 8th down to the 1st
+        for row, row_text in enumerate(reversed(placement.split('/'))):
+            column = 0
+            for character in row_text:
+                if character.isdigit():
+                    column += int(character)
+                    continue
+                color = WHITE if character.isupper() else BLACK
+                piece_type = fen_piece_types[character.lower()]
+                self._add_piece(PIECE_CLASSES[piece_type](
+                    color, row*BOARD_SIZE + column))
+                column += 1
+
+        if turn == 'w':
+            self.turn_color = WHITE
+        else:
+            self.turn_color = BLACK
+        self.castling_rights = 0
+        for letter, castling_right in CASTLING_LETTERS:
+            if letter in castling:
+                self.castling_rights |= castling_right
+        if en_passant == '-':
+            self.en_passant_square = None
+        else:
+            self.en_passant_square = algebraic_to_index(en_passant)
+
+        # Only pawns on their starting row and kings and rooks that can still
+        # castle count as unmoved
+        for piece in self.pieces:
+            piece.has_been_moved = not self._is_unmoved(piece)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.pawn_key = self.compute_pawn_key()
+        self.key_history = [self.zobrist_key]
+        self.in_check = self.is_king_attacked(self.turn_color)
+
+    def compute_zobrist_key(self):
+        """Works out the Zobrist key of the position from scratch. The key
+        is normally kept up to date as moves are made instead"""
+        zobrist_key = CASTLING_KEYS[self.castling_rights]
+        for piece in self.pieces:
+            zobrist_key ^= PIECE_KEYS[piece.color][piece.piece_type][
+                piece.position]
+        if self.turn_color == BLACK:
+            zobrist_key ^= BLACK_TO_MOVE_KEY
+        return zobrist_key ^ self._en_passant_key()
+
+    def _en_passant_key(self):
+        """Returns the Zobrist key of the en passant square, or 0 if no pawn
+        of the side to move can capture onto it. Otherwise the position
+        would not match the same one reached without a double push"""
+        en_passant_square = self.en_passant_square
+        if en_passant_square is None:
+            return 0
+        # The pawns that can capture onto the square are on the squares a
+        # pawn of the other color would attack from it
+        if self.turn_color == WHITE:
+            capturers = PAWN_ATTACKS[BLACK][en_passant_square] & \
+                self.piece_bitboards[WHITE][PAWN]
+        else:
+            capturers = PAWN_ATTACKS[WHITE][en_passant_square] & \
+                self.piece_bitboards[BLACK][PAWN]
+        if not capturers:
+            return 0
+        return EN_PASSANT_KEYS[en_passant_square & 7]
+
+    def compute_pawn_key(self):
+        """Works out the Zobrist key of the pawns alone from scratch"""
+        pawn_key = 0
+        for color in (WHITE, BLACK):
+            for pawn in self.piece_lists[color][PAWN]:
+                pawn_key ^= PIECE_KEYS[color][PAWN][pawn.position]
+        return pawn_key
+
+    def _is_unmoved(self, piece):
+        """Works out from the position and castling rights if the piece can
+        still be treated as never having moved"""
+        row = piece.position >> 3
+        if piece.piece_type == PAWN:
+            return row == (1 if piece.color == WHITE else 6)
+        if piece.piece_type in (KING, ROOK):
+            lost_rights = CASTLING_RIGHTS_LOST[piece.position]
+            if piece.color == WHITE:
+                lost_rights &= WHITE_KING_SIDE | WHITE_QUEEN_SIDE
+            else:
+                lost_rights &= BLACK_KING_SIDE | BLACK_QUEEN_SIDE
+            return bool(lost_rights & self.castling_rights)
+        return False
+
+    def return_fen(self):
+        """Returns the position in Forsyth-Edwards Notation"""
+        rows = []
+        for row in range(BOARD_SIZE - 1, -1, -1):
+            row_text = ''
+            empty_squares = 0
+            for column in range(BOARD_SIZE):
+                piece = self.squares[row*BOARD_SIZE + column]
+                if piece is None:
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    row_text += str(empty_squares)
+                    empty_squares = 0
+                letter = fen_letters[piece.piece_type]
+                if piece.color == WHITE:
+                    letter = letter.upper()
+                row_text += letter
+            if empty_squares:
+                row_text += str(empty_squares)
+            rows.append(row_text)
+        castling = ''.join(letter for letter, castling_right
+                           in CASTLING_LETTERS
+                           if self.castling_rights & castling_right)
+        if self.en_passant_square is None:
+            en_passant = '-'
+        else:
+            en_passant = index_to_algebraic(self.en_passant_square)
+        return ' '.join(('/'.join(rows), 'w' if self.turn_color == WHITE
+                         else 'b', castling or '-', en_passant,
+                         str(self.halfmove_clock),
+                         str(self.fullmove_number)))
+
+    def return_piece(self, position):
+        """Returns the chess piece object from the passed position (or None
+        if there is no piece)"""
+        return self.squares[position]
+
+    def return_pieces(self, color, piece_type):
+        """Returns the list of pieces of the passed color and type. The list
+        is kept up to date as pieces move and must not be changed by the
+        caller"""
+        return self.piece_lists[color][piece_type]
+
+    def return_piece_bitboard(self, color, piece_type):
+        """Returns a bitboard with the squares of the pieces of the passed
+        color and type"""
+        return self.piece_bitboards[color][piece_type]
+
+    def return_king_position(self, color):
+        """Returns the square of the passed color's king (or None if the
+        king has been captured)"""
+        kings = self.piece_lists[color][KING]
+        if kings:
+            return kings[0].position
+        return None
+
+    def return_squares(self):
+        """Returns the list with the chess piece on each square index (or
+        None if there is no piece). The list is kept up to date as pieces
+        move and must not be changed by the caller"""
+        return self.squares
+
+    def return_occupancy(self):
+        """Returns the dictionary of bitboards with the squares occupied by
+        each color. The bitboards are kept up to date as pieces move"""
+        return self.occupancy
+
+    def check_potential_moves(self, piece):
+        """Fills in the potential moves, captures and special moves of the
+        passed piece for the current position"""
+        self.move_generator.check_potential_moves(self, piece)
+
+    def is_promotion_move(self, piece, new_position):
+        """Returns True if moving the piece to the new position promotes it"""
+        if piece.piece_type != PAWN:
+            return False
+        if piece.color == WHITE:
+            return new_position >> 3 == 7
+        return new_position >> 3 == 0
+
+    def _add_piece(self, piece):
+        """Adds the passed piece to the board on its current position"""
+        self.pieces.append(piece)
+        self.squares[piece.position] = piece
+        self.occupancy[piece.color] |= 1 << piece.position
+        self.piece_lists[piece.color][piece.piece_type].append(piece)
+        self.piece_bitboards[piece.color][piece.piece_type] |= \
+            1 << piece.position
+        self.zobrist_key ^= PIECE_KEYS[piece.color][piece.piece_type][
+            piece.position]
+        if piece.piece_type == PAWN:
+            self.pawn_key ^= PIECE_KEYS[piece.color][PAWN][piece.position]
+        self.middlegame_score += MIDDLEGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type][piece.position]
+        self.endgame_score += ENDGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type][piece.position]
+        self.phase += PHASE_WEIGHTS[piece.piece_type]
+
+    def _remove_piece(self, piece):
+        """Removes the passed piece from the board"""
+        self.pieces.remove(piece)
+        self.squares[piece.position] = None
+        self.occupancy[piece.color] ^= 1 << piece.position
+        self.piece_lists[piece.color][piece.piece_type].remove(piece)
+        self.piece_bitboards[piece.color][piece.piece_type] ^= \
+            1 << piece.position
+        self.zobrist_key ^= PIECE_KEYS[piece.color][piece.piece_type][
+            piece.position]
+        if piece.piece_type == PAWN:
+            self.pawn_key ^= PIECE_KEYS[piece.color][PAWN][piece.position]
+        self.middlegame_score -= MIDDLEGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type][piece.position]
+        self.endgame_score -= ENDGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type][piece.position]
+        self.phase -= PHASE_WEIGHTS[piece.piece_type]
+
+    def _relocate_piece(self, piece, new_position):
+        """Moves the passed piece to an empty square"""
+        self.squares[piece.position] = None
+        self.squares[new_position] = piece
+        move_bits = (1 << piece.position) | (1 << new_position)
+        self.occupancy[piece.color] ^= move_bits
+        self.piece_bitboards[piece.color][piece.piece_type] ^= move_bits
+        piece_keys = PIECE_KEYS[piece.color][piece.piece_type]
+        self.zobrist_key ^= piece_keys[piece.position] ^ \
+            piece_keys[new_position]
+        if piece.piece_type == PAWN:
+            self.pawn_key ^= piece_keys[piece.position] ^ \
+                piece_keys[new_position]
+        square_scores = MIDDLEGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type]
+        self.middlegame_score += square_scores[new_position] - \
+            square_scores[piece.position]
+        square_scores = ENDGAME_SQUARE_SCORES[piece.color][piece.piece_type]
+        self.endgame_score += square_scores[new_position] - \
+            square_scores[piece.position]
+        piece.update_position(new_position)
+
+    def generate_moves(self):
+        """Returns a list of all the moves for the side to move. The moves
+        follow the pieces' movement rules but may leave the king in check"""
+        moves = []
+        for piece in list(self.pieces):
+            if piece.color != self.turn_color:
+                continue
+            self.move_generator.check_potential_moves(self, piece)
+            start = piece.position
+            for move_list in (piece.possible_captures, piece.possible_moves,
+                              piece.possible_special_moves):
+                for end in move_list:
+                    if self.is_promotion_move(piece, end):
+                        for piece_type in PROMOTION_TYPES:
+                            moves.append(Move(start, end, piece_type))
+                    else:
+                        moves.append(Move(start, end))
+        return moves
+
+    def generate_captures(self):
+        """Returns a list of the captures (including en passant) and queen
+        promotions for the side to move. Like generate_moves the moves may
+        leave the king in check"""
+        moves = []
+        if self.turn_color == WHITE:
+            enemy_occupancy = self.occupancy[BLACK]
+        else:
+            enemy_occupancy = self.occupancy[WHITE]
+        for piece in list(self.pieces):
+            if piece.color != self.turn_color:
+                continue
+            if piece.piece_type != PAWN:
+                self.move_generator.add_moves(self, piece, moves,
+                                              enemy_occupancy)
+                continue
+            # Pawn pushes onto the end row count as captures
+            self.move_generator.add_moves(self, piece, moves,
+                                          enemy_occupancy | PROMOTION_ROWS,
+                                          (QUEEN,))
+            self._add_en_passant(moves, piece)
+        return moves
+
+    def return_checks_and_pins(self, color):
+        """Looks outward from the passed color's king and returns a bitboard
+        of the enemy pieces giving check, a bitboard of the squares any other
+        piece has to move to to deal with a single check (every square if
+        not in check) and a dictionary with the squares each pinned piece
+        can still move to keyed by its square"""
+        king_square = self.return_king_position(color)
+        if color == WHITE:
+            enemy = BLACK
+        else:
+            enemy = WHITE
+        enemy_pieces = self.piece_bitboards[enemy]
+        own_occupancy = self.occupancy[color]
+        enemy_occupancy = self.occupancy[enemy]
+        checkers = (KNIGHT_ATTACKS[king_square] & enemy_pieces[KNIGHT]) | \
+            (PAWN_ATTACKS[color][king_square] & enemy_pieces[PAWN])
+        check_mask = checkers
+        pins = {}
+        for directions, sliders in (
+                (ROOK_DIRECTIONS, enemy_pieces[ROOK] | enemy_pieces[QUEEN]),
+                (BISHOP_DIRECTIONS,
+                 enemy_pieces[BISHOP] | enemy_pieces[QUEEN])):
+            for direction in directions:
+                if not RAYS[direction][king_square] & sliders:
+                    continue
+                # Walk out until an enemy piece, remembering the first of
+                # the king's own pieces in the way
+                ray_mask = 0
+                pinned_square = None
+                for square in RAY_SQUARES[direction][king_square]:
+                    square_bit = 1 << square
+                    ray_mask |= square_bit
+                    if square_bit & own_occupancy:
+                        if pinned_square is not None:
+                            break
+                        pinned_square = square
+                    elif square_bit & enemy_occupancy:
+                        if square_bit & sliders:
+                            if pinned_square is None:
+                                checkers |= square_bit
+                                check_mask |= ray_mask
+                            else:
+                                pins[pinned_square] = ray_mask
+                        break
+        if not checkers:
+            check_mask = FULL_BOARD
+        return checkers, check_mask, pins
+
+    def add_target_moves(self, moves, piece, targets,
+                         promotion_types=PROMOTION_TYPES):
+        """Adds the moves of the piece to every square set in the targets
+        bitboard to the list, once for each of the promotion types for a
+        pawn reaching the end row"""
+        start = piece.position
+        if piece.piece_type == PAWN and targets & PROMOTION_ROWS:
+            while targets:
+                lowest_bit = targets & -targets
+                end = lowest_bit.bit_length() - 1
+                if lowest_bit & PROMOTION_ROWS:
+                    for piece_type in promotion_types:
+                        moves.append(Move(start, end, piece_type))
+                else:
+                    moves.append(MOVES[start][end])
+                targets ^= lowest_bit
+            return
+        start_moves = MOVES[start]
+        while targets:
+            lowest_bit = targets & -targets
+            moves.append(start_moves[lowest_bit.bit_length() - 1])
+            targets ^= lowest_bit
+
+    def _add_en_passant(self, moves, piece):
+        """Adds the pawn's en passant capture to the list if it has one"""
+        en_passant_square = self.en_passant_square
+        if en_passant_square is not None and \
+                PAWN_ATTACKS[piece.color][piece.position] >> \
+                en_passant_square & 1:
+            moves.append(Move(piece.position, en_passant_square))
+
+    def legal_moves(self):
+        """Returns the list of moves for the side to move that don't leave
+        its own king in check. Pinned pieces only move along their pin, a
+        single check has to be captured or blocked, only the king can move
+        out of a double check and a king can't castle out of, through or
+        into check"""
+        color = self.turn_color
+        king_square = self.return_king_position(color)
+        if king_square is None:
+            return self.generate_moves()
+        if color == WHITE:
+            enemy = BLACK
+        else:
+            enemy = WHITE
+        checkers, check_mask, pins = self.return_checks_and_pins(color)
+        double_check = checkers & (checkers - 1)
+        # Sliders attack straight through the king's old square
+        occupied_without_king = (self.occupancy[WHITE] |
+                                 self.occupancy[BLACK]) ^ (1 << king_square)
+        legal_moves = []
+        for piece in list(self.pieces):
+            if piece.color != color:
+                continue
+            if piece.piece_type == KING:
+                self.move_generator.check_potential_moves(self, piece)
+                for move_list in (piece.possible_captures,
+                                  piece.possible_moves):
+                    for end in move_list:
+                        if not self.is_square_attacked(
+                                end, enemy, occupied_without_king):
+                            legal_moves.append(Move(king_square, end))
+                if not checkers:
+                    for end in piece.possible_special_moves:
+                        if not self.is_square_attacked(
+                                (king_square + end)//2, enemy) and \
+                                not self.is_square_attacked(end, enemy):
+                            legal_moves.append(Move(king_square, end))
+                continue
+            if double_check:
+                continue
+            self.move_generator.add_moves(
+                self, piece, legal_moves,
+                check_mask & pins.get(piece.position, FULL_BOARD))
+            if piece.piece_type != PAWN or self.en_passant_square is None:
+                continue
+            # En passant takes two pawns off one row and can uncover a check
+            # along it, so it is simply tried out
+            en_passant_moves = []
+            self._add_en_passant(en_passant_moves, piece)
+            for move in en_passant_moves:
+                self.make_move(move)
+                if not self.is_king_attacked(color):
+                    legal_moves.append(move)
+                self.unmake_move()
+        return legal_moves
+
+    def return_legal_moves(self):
+        """Returns the legal moves of the side to move as a tuple. They are
+        only worked out once for each position played on the board, so the
+        display, the check for the end of the game and the move itself all
+        share them"""
+        if self._legal_moves_key != self.zobrist_key:
+            self._legal_moves = tuple(self.legal_moves())
+            self._legal_moves_key = self.zobrist_key
+        return self._legal_moves
+
+    def make_move(self, move):
+        """Plays the passed move and saves what is needed to take it back
+        on the undo stack. Returns the captured piece (or None)"""
+        start, end, promotion = move
+        self._legal_moves_key = None
+        piece = self.squares[start]
+        captured_piece = self.squares[end]
+        if piece.piece_type == PAWN and end == self.en_passant_square:
+            # En passant captures the pawn behind the square moved to
+            if piece.color == WHITE:
+                captured_piece = self.squares[end - BOARD_SIZE]
+            else:
+                captured_piece = self.squares[end + BOARD_SIZE]
+        promoted_piece = None
+        if promotion is not None:
+            pool = self._promotion_pool[piece.color][promotion]
+            if pool:
+                promoted_piece = pool.pop()
+                promoted_piece.update_position(end)
+                promoted_piece.clear_potential_moves()
+            else:
+                promoted_piece = PIECE_CLASSES[promotion](piece.color, end)
+            promoted_piece.has_been_moved = True
+        self.move_history.append(UndoRecord(move, piece, captured_piece,
+                                            promoted_piece,
+                                            self.castling_rights,
+                                            self.en_passant_square,
+                                            piece.has_been_moved,
+                                            self.zobrist_key,
+                                            self.halfmove_clock))
+
+        # The old en passant square comes out of the key before any pawns
+        # move and the new one goes in once the turn has passed
+        self.zobrist_key ^= self._en_passant_key()
+        self.en_passant_square = None
+        if captured_piece is not None:
+            self._remove_piece(captured_piece)
+        self._relocate_piece(piece, end)
+        piece.has_been_moved = True
+        if promoted_piece is not None:
+            self._remove_piece(piece)
+            self._add_piece(promoted_piece)
+        elif piece.piece_type == PAWN and abs(end - start) == 2*BOARD_SIZE:
+            self.en_passant_square = (start + end)//2
+        elif piece.piece_type == KING and abs(end - start) == 2:
+            # A castle also moves the rook over to the other side of the king
+            if end > start:
+                rook_piece = self.squares[end + 1]
+                self._relocate_piece(rook_piece, end - 1)
+            else:
+                rook_piece = self.squares[end - 2]
+                self._relocate_piece(rook_piece, end + 1)
+            rook_piece.has_been_moved = True
+
+        # Update the castling rights for anything moving off of or onto the
+        # king and rook starting squares
+        self.zobrist_key ^= CASTLING_KEYS[self.castling_rights]
+        self.castling_rights &= ~(CASTLING_RIGHTS_LOST[start] |
+                                  CASTLING_RIGHTS_LOST[end])
+        self.zobrist_key ^= CASTLING_KEYS[self.castling_rights] ^ \
+            BLACK_TO_MOVE_KEY
+        if captured_piece is not None or piece.piece_type == PAWN:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if self.turn_color == BLACK:
+            self.fullmove_number += 1
+        self._update_turn_color()
+        self.zobrist_key ^= self._en_passant_key()
+        self.key_history.append(self.zobrist_key)
+        return captured_piece
+
+    def make_null_move(self):
+        """Passes the turn to the other side without moving anything. Used
+        by the search to test if a position is still good after giving the
+        opponent a free move. Repetitions aren't looked for back past it.
+        Taken back with unmake_move"""
+        self._legal_moves_key = None
+        self.move_history.append(UndoRecord(None, None, None, None,
+                                            self.castling_rights,
+                                            self.en_passant_square, None,
+                                            self.zobrist_key,
+                                            self.halfmove_clock))
+        self.halfmove_clock = 0
+        self.zobrist_key ^= self._en_passant_key()
+        self.en_passant_square = None
+        self.zobrist_key ^= BLACK_TO_MOVE_KEY
+        self._update_turn_color()
+        self.key_history.append(self.zobrist_key)
+
+    def unmake_move(self):
+        """Takes back the last move played with make_move (or null move
+        played with make_null_move) and returns it"""
+        move, piece, captured_piece, promoted_piece, castling_rights, \
+            en_passant_square, has_been_moved, zobrist_key, \
+            halfmove_clock = self.move_history.pop()
+        self._legal_moves_key = None
+        self.key_history.pop()
+        self._update_turn_color()
+        self.halfmove_clock = halfmove_clock
+        if move is None:
+            self.en_passant_square = en_passant_square
+            self.zobrist_key = zobrist_key
+            return None
+        if self.turn_color == BLACK:
+            self.fullmove_number -= 1
+        start, end, _ = move
+
+        if promoted_piece is not None:
+            self._remove_piece(promoted_piece)
+            self._add_piece(piece)
+            self._promotion_pool[promoted_piece.color][
+                promoted_piece.piece_type].append(promoted_piece)
+        elif piece.piece_type == KING and abs(end - start) == 2:
+            if end > start:
+                rook_piece = self.squares[end - 1]
+                self._relocate_piece(rook_piece, end + 1)
+            else:
+                rook_piece = self.squares[end + 1]
+                self._relocate_piece(rook_piece, end - 2)
+            rook_piece.has_been_moved = False
+        self._relocate_piece(piece, start)
+        piece.has_been_moved = has_been_moved
+        if captured_piece is not None:
+            self._add_piece(captured_piece)
+
+        self.castling_rights = castling_rights
+        self.en_passant_square = en_passant_square
+        self.zobrist_key = zobrist_key
+        return move
+
+    def move_piece(self, piece, new_position, promotion_type=None):
+        """Moves the chess piece to a new position, handles any captures and
+        special moves and passes the turn to the other player. Returns the
+        captured piece (or None if nothing was captured)"""
+        if not self.is_promotion_move(piece, new_position):
+            promotion_type = None
+        logging.info(f'Moving the {piece.color} {piece.piece_type} from '
+                     f'{index_to_square(piece.position)} to '
+                     f'{index_to_square(new_position)}')
+        captured_piece = self.make_move(Move(piece.position, new_position,
+                                             promotion_type))
+        if captured_piece is not None:
+            logging.info(f'The {captured_piece.color} '
+                         f'{captured_piece.piece_type} at position '
+                         f'{index_to_square(captured_piece.position)} was '
+                         f'captured!')
+
+        # Check if the king was captured and, if so, end the game
+        if captured_piece is not None and captured_piece.piece_type == KING:
+            logging.info(f'The {captured_piece.color} king has just been '
+                         f'captured. The game is over.')
+            self.winner = piece.color
+            return captured_piece
+
+        if promotion_type is not None:
+            logging.info(f'Promoted the {piece.color} {PAWN} at '
+                         f'{index_to_square(new_position)} to a '
+                         f'{promotion_type}')
+
+        # Check if the player to move is now in check and if they have any
+        # legal moves left
+        self.in_check = self.is_king_attacked(self.turn_color)
+        if not self.return_legal_moves():
+            if self.in_check:
+                logging.info(f'Checkmate! The {piece.color} pieces win')
+                self.result = CHECKMATE
+                self.winner = piece.color
+            else:
+                logging.info('Stalemate! The game is a draw')
+                self.result = STALEMATE
+        elif self.is_repetition(3):
+            logging.info('The position has been repeated three times. The '
+                         'game is a draw')
+            self.result = THREEFOLD_REPETITION
+        elif self.is_fifty_move_draw():
+            logging.info('Fifty moves without a capture or pawn move. The '
+                         'game is a draw')
+            self.result = FIFTY_MOVE_RULE
+        return captured_piece
+
+    def is_repetition(self, times=3):
+        """Returns True if the current position has now been reached the
+        passed number of times. Only positions since the last capture or
+        pawn move (or null move) can repeat so the scan stops there"""
+        key_history = self.key_history
+        zobrist_key = key_history[-1]
+        count = 1
+        last_index = len(key_history) - 1
+        first_index = max(last_index - self.halfmove_clock, 0)
+        # Only positions with the same side to move can match
+        for index in range(last_index - 4, first_index - 1, -2):
+            if key_history[index] == zobrist_key:
+                count += 1
+                if count >= times:
+                    return True
+        return False
+
+    def is_fifty_move_draw(self):
+        """Returns True if fifty moves have been played by each side without
+        a capture or pawn move"""
+        return self.halfmove_clock >= FIFTY_MOVE_LIMIT
+
+    def _update_turn_color(self):
+        """Passes the turn over to the other color"""
+        if self.turn_color == WHITE:
+            self.turn_color = BLACK
+        else:
+            self.turn_color = WHITE
+
+    def is_king_attacked(self, color):
+        """Determines if the king of the passed color is attacked by any of
+        the other side's pieces"""
+        king_bit = self.piece_bitboards[color][KING]
+        if not king_bit:
+            return False
+        king_square = king_bit.bit_length() - 1
+        if color == WHITE:
+            attacked = self.is_square_attacked(king_square, BLACK)
+        else:
+            attacked = self.is_square_attacked(king_square, WHITE)
+        if attacked:
+            logging.debug(f'The {color} {KING} at position '
+                          f'{index_to_square(king_square)} is in check!')
+        return attacked
+
+    def attackers_to(self, square, occupied):
+        """Returns a bitboard of the pieces of both colors that attack the
+        square when only the squares in the occupied bitboard block rays.
+        Pieces not in the occupied bitboard are included too"""
+        white_pieces = self.piece_bitboards[WHITE]
+        black_pieces = self.piece_bitboards[BLACK]
+        rooks = white_pieces[ROOK] | black_pieces[ROOK] | \
+            white_pieces[QUEEN] | black_pieces[QUEEN]
+        bishops = white_pieces[BISHOP] | black_pieces[BISHOP] | \
+            white_pieces[QUEEN] | black_pieces[QUEEN]
+        return (KNIGHT_ATTACKS[square] &
+                (white_pieces[KNIGHT] | black_pieces[KNIGHT])) | \
+            (KING_ATTACKS[square] &
+             (white_pieces[KING] | black_pieces[KING])) | \
+            (PAWN_ATTACKS[BLACK][square] & white_pieces[PAWN]) | \
+            (PAWN_ATTACKS[WHITE][square] & black_pieces[PAWN]) | \
+            (rook_attacks(square, occupied) & rooks) | \
+            (bishop_attacks(square, occupied) & bishops)
+
+    def is_square_attacked(self, square, by_color, occupied=None):
+        """Determines if any piece of the passed color attacks the square by
+        looking outward from the square with the attack and ray tables. An
+        occupied bitboard can be passed to see through pieces"""
+        pieces = self.piece_bitboards[by_color]
+        if KNIGHT_ATTACKS[square] & pieces[KNIGHT] or \
+                KING_ATTACKS[square] & pieces[KING]:
+            return True
+        # A pawn attacks the square if a pawn of the other color on the
+        # square would attack the pawn
+        if by_color == WHITE:
+            if PAWN_ATTACKS[BLACK][square] & pieces[PAWN]:
+                return True
+        elif PAWN_ATTACKS[WHITE][square] & pieces[PAWN]:
+            return True
+        if occupied is None:
+            occupied = self.occupancy[WHITE] | self.occupancy[BLACK]
+        queens = pieces[QUEEN]
+        if rook_attacks(square, occupied) & (pieces[ROOK] | queens):
+            return True
+        return bool(bishop_attacks(square, occupied) &
+                    (pieces[BISHOP] | queens))
@@ -5,7 +5,10 @@ Created on Sun Dec 22 16:35:26 2019
 """
 
 import logging
-from tkinter import Tk, Toplevel, Button, Label
+from tkinter import Tk, Toplevel, Button, Canvas, Label
+from board import Board
+from helpful_dictionaries import text_color, tile_positions
+from helpful_functions import index_to_square
 
 WHITE = 'White'
 BLACK = 'Black'
@@ -15,15 +18,36 @@ KNIGHT = 'Knight'
 PAWN = 'Pawn'
 QUEEN = 'Queen'
 ROOK = 'Rook'
+BUTTON_SIZE = 50
+TILE_SIZE = 100
+
+
+def return_tile_corner(square):
+    """Returns the canvas x and y position of the top left corner of the
+    square's tile"""
+    return (square & 7)*TILE_SIZE, (7 - (square >> 3))*TILE_SIZE
 
 
 class BoardDisplay():
-    """Class that implements the Tkinter display of the chess board"""
+    """Class that implements the Tkinter display of the chess board. The
+    tiles and pieces are all items on one canvas and only the squares whose
+    contents change are redrawn"""
     def __init__(self):
         # Display
         self.root = None
+        self.canvas = None
+        # Instance variables
+        self._piece_items = []
+        self._label_items = []
+        self._hint_items = []
+        self._hint_label_items = []
+        self._shown_squares = [None]*64
+        self._shown_hints = {}
+        self._click_callback = None
+        self._disabled = False
         # Initialization methods
         self._create_display_geometry()
+        self._create_board_items()
 
     def _create_display_geometry(self):
         """Creates the display geometry"""
@@ -40,38 +64,136 @@ class BoardDisplay():
                                             display_height,
                                             display_x_pos,
                                             display_y_pos))
+        self.canvas = Canvas(self.root, width=display_width,
+                             height=display_height, highlightthickness=0,
+                             cursor='hand2')
+        self.canvas.place(x=0, y=0)
+        self.canvas.bind('<ButtonRelease-1>', self._canvas_clicked)
 
-        # Create the checkerboard tiles
-        # Adding the tiles to the Tk root because they will never change
-        board_positions = (0, 100, 200, 300, 400, 500, 600, 700)
-        size = 100
+    def _create_board_items(self):
+        """Draws the checkerboard tiles and a hidden piece on every square.
+        The tiles never change and the pieces are only ever reconfigured"""
         light_color = "bisque2"
         dark_color = "darkgoldenrod4"
-        for y_pos in board_positions:
-            if (y_pos/100)%2 == 0:
-                for x_pos in board_positions:
-                    if (x_pos/100)%2 == 0:
-                        square = Label(self.root, bg=light_color)
-                        square.place(x=x_pos, y=y_pos, height=size, width=size)
-                    else:
-                        square = Label(self.root, bg=dark_color)
-                        square.place(x=x_pos, y=y_pos, height=size, width=size)
+        for square in range(64):
+            x_pos, y_pos = return_tile_corner(square)
+            if ((square >> 3) + (square & 7)) % 2 == 0:
+                tile_color = dark_color
             else:
-                for x_pos in board_positions:
-                    if (x_pos/100)%2 == 0:
-                        square = Label(self.root, bg=dark_color)
-                        square.place(x=x_pos, y=y_pos, height=size, width=size)
-                    else:
-                        square = Label(self.root, bg=light_color)
-                        square.place(x=x_pos, y=y_pos, height=size, width=size)
+                tile_color = light_color
+            self.canvas.create_rectangle(x_pos, y_pos, x_pos + TILE_SIZE,
+                                         y_pos + TILE_SIZE, fill=tile_color,
+                                         width=0)
+        for square in range(64):
+            tile_position = tile_positions[index_to_square(square)]
+            self._piece_items.append(self.canvas.create_rectangle(
+                tile_position.x, tile_position.y,
+                tile_position.x + BUTTON_SIZE, tile_position.y + BUTTON_SIZE,
+                state='hidden'))
+            self._label_items.append(self.canvas.create_text(
+                tile_position.x + BUTTON_SIZE//2,
+                tile_position.y + BUTTON_SIZE//2, state='hidden'))
+        # One move hint per square drawn over the pieces, only ever shown,
+        # hidden and recoloured
+        for square in range(64):
+            tile_position = tile_positions[index_to_square(square)]
+            self._hint_items.append(self.canvas.create_rectangle(
+                tile_position.x, tile_position.y,
+                tile_position.x + BUTTON_SIZE, tile_position.y + BUTTON_SIZE,
+                state='hidden'))
+            self._hint_label_items.append(self.canvas.create_text(
+                tile_position.x + BUTTON_SIZE//2,
+                tile_position.y + BUTTON_SIZE//2, text='??',
+                fill=text_color[WHITE], state='hidden'))
+
+    def show_board(self, board):
+        """Draws the pieces on the board, only redrawing the squares whose
+        contents have changed since the last time"""
+        squares = [(piece.color, piece.piece_type) if piece else None
+                   for piece in board.squares]
+        self.show_squares(squares)
+
+    def show_position(self, fen, moves=()):
+        """Draws the position reached by playing the moves from the FEN"""
+        board = Board(fen=fen)
+        for move in moves:
+            board.make_move(move)
+        self.show_board(board)
+
+    def show_squares(self, squares):
+        """Draws the contents of each square, a (color, piece type) pair or
+        None, redrawing only the squares that have changed"""
+        for square, contents in enumerate(squares):
+            if contents == self._shown_squares[square]:
+                continue
+            self._shown_squares[square] = contents
+            if contents is None:
+                self.canvas.itemconfigure(self._piece_items[square],
+                                          state='hidden')
+                self.canvas.itemconfigure(self._label_items[square],
+                                          state='hidden')
+                continue
+            color, piece_type = contents
+            self.canvas.itemconfigure(self._piece_items[square],
+                                      fill=color, state='normal')
+            self.canvas.itemconfigure(self._label_items[square],
+                                      text=piece_type[0],
+                                      fill=text_color[color],
+                                      state='normal')
+
+    def show_hints(self, hints):
+        """Shows a move hint on each square in the passed dictionary of
+        square indexes and hint colors, hiding any other hints"""
+        for square in list(self._shown_hints):
+            if square not in hints:
+                del self._shown_hints[square]
+                self.canvas.itemconfigure(self._hint_items[square],
+                                          state='hidden')
+                self.canvas.itemconfigure(self._hint_label_items[square],
+                                          state='hidden')
+        for square, color in hints.items():
+            if self._shown_hints.get(square) == color:
+                continue
+            self._shown_hints[square] = color
+            self.canvas.itemconfigure(self._hint_items[square], fill=color,
+                                      state='normal')
+            self.canvas.itemconfigure(self._hint_label_items[square],
+                                      state='normal')
+
+    def clear_hints(self):
+        """Hides all of the move hints"""
+        self.show_hints({})
+
+    def set_click_callback(self, callback):
+        """Sets the function called with the square index of every click on
+        the board"""
+        self._click_callback = callback
+
+    def disable(self):
+        """Stops passing on clicks, for when the game is over"""
+        self._disabled = True
+        self.canvas.configure(cursor='')
+
+    def _canvas_clicked(self, event):
+        """Passes the square index of a click on to the click callback"""
+        logging.debug(f'Canvas click event was {event}')
+        if self._disabled or self._click_callback is None:
+            return
+        column = event.x // TILE_SIZE
+        row = 7 - event.y // TILE_SIZE
+        if 0 <= column < 8 and 0 <= row < 8:
+            self._click_callback(row*8 + column)
 
 
 class PromotionDisplay():
-    """Class that implements the Tkinter display for the promotion choice"""
-    def __init__(self):
+    """Class that implements the Tkinter display for the promotion choice.
+    Nothing waits on it, the callback is called with the chosen piece type
+    (or None if the window is closed without choosing)"""
+    def __init__(self, callback):
         # Display and instance variables
         self.root = None
         self.chosen_piece = None
+        self._callback = callback
         # Initialization methods
         self._create_display_geometry()
         self._add_widgets()
@@ -90,6 +212,7 @@ class PromotionDisplay():
                                             display_height,
                                             display_x_pos,
                                             display_y_pos))
+        self.root.protocol('WM_DELETE_WINDOW', self._window_closed)
 
     def _add_widgets(self):
         """Adds the widgets to the promotion display"""
@@ -135,6 +258,12 @@ class PromotionDisplay():
         logging.info("The piece chosen for promotion was a %s", piece_type)
         self.chosen_piece = piece_type
         self.root.destroy()
+        self._callback(piece_type)
+
+    def _window_closed(self):
+        """Passes on that no piece was chosen if the window is closed"""
+        self.root.destroy()
+        self._callback(None)
 
 
 class TurnDisplay():
@@ -183,8 +312,28 @@ class TurnDisplay():
         self._turn_label.configure(text=message_text,
                                    bg=display_bg, fg=display_fg)
 
-    def show_game_over_display(self, winner):
-        """Updates the display to show the game over text"""
-        game_over_text = "Game over! " + winner + " wins!"
+    def show_thinking(self, turn_color, depth, score_text):
+        """Shows how far the computer has got thinking about its move"""
+        message_text = (f'{turn_color} is thinking...\n'
+                        f'depth {depth}  score {score_text}')
+        self._turn_label.configure(text=message_text, bg='grey',
+                                   fg='white')
+
+    def show_engine_error(self, turn_color):
+        """Shows that the computer failed to find a move so the user has to
+        play it"""
+        message_text = (f'The computer failed to move!\n'
+                        f'{turn_color}, it\'s your turn')
+        self._turn_label.configure(text=message_text, bg='red', fg='white')
+
+    def show_game_over_display(self, winner, result=None):
+        """Updates the display to show the game over text with the winner
+        (or None for a draw) and how the game ended"""
+        if winner is None:
+            game_over_text = "Game over! " + result + ", it's a draw!"
+        elif result is not None:
+            game_over_text = result + "! " + winner + " wins!"
+        else:
+            game_over_text = "Game over! " + winner + " wins!"
         self._turn_label.configure(text=game_over_text,
                                    bg='orange', fg='black')
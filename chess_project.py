@@ -6,11 +6,27 @@ Created on Fri Nov 30 19:02:32 2018
 @author: danielb
 """
 
+import argparse
 import logging
-from game import Game
+import sys
+import uci
 
-def main():
+def main(arguments=None):
     """Main function"""
+    parser = argparse.ArgumentParser(description='Play chess')
+    parser.add_argument('--computer', choices=('White', 'Black'),
+                        help='color for the computer to play')
+    parser.add_argument('--think-time', type=float, default=1.0,
+                        help='seconds the computer thinks for each move')
+    parser.add_argument('--uci', action='store_true',
+                        help='run the engine with the UCI protocol on stdin '
+                        'and stdout instead of the GUI')
+    arguments = parser.parse_args(arguments)
+    # The GUI (and so tkinter) is only imported when it is going to be used
+    if arguments.uci:
+        return uci.main()
+    from game import Game
+
     # Start up logging
     logging.basicConfig(
         format='[%(asctime)s] %(levelname)s : %(funcName)s() - %(message)s',
@@ -18,12 +34,13 @@ def main():
     logging.info("Starting the game and the logger")
 
     # Start the game
-    game = Game()
+    game = Game(arguments.computer, arguments.think_time)
     game.maintain_display()
 
     # Close the logger
     logging.info("Ending the game and shutting down the logger")
     logging.shutdown()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
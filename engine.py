@@ -0,0 +1,513 @@
+"""
+Alpha-beta search for picking moves
+
+Created on Sun Oct 18 23:06:47 2026
+
+@author: danielb
+"""
+
+import argparse
+import logging
+import math
+import sys
+import threading
+import time
+from collections import namedtuple
+from board import Board, STARTING_FEN
+from evaluation import PIECE_VALUES, evaluate, non_pawn_material, \
+    static_exchange
+from helpful_functions import move_to_text
+from move_ordering import MoveOrderer, is_quiet
+from pawn_structure import PawnHashTable
+from transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND, \
+    TranspositionTable
+
+MATE_SCORE = 100000
+# Scores beyond this are mates and are stored relative to the node
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+MAX_DEPTH = 64
+# How many nodes are searched between checks of the clock
+NODES_PER_TIME_CHECK = 1024
+# An iteration isn't started once this much of the time limit is used up
+# since it would almost certainly not finish
+ITERATION_TIME_FRACTION = 0.5
+
+# Null move pruning searches the position after passing the turn this much
+# shallower (one more from NULL_MOVE_DEEP_DEPTH on). With no more non-pawn
+# material than a rook zugzwang is likely, so a null move cutoff is only
+# trusted once a reduced normal search agrees
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_DEEP_DEPTH = 7
+NULL_MOVE_VERIFICATION_MATERIAL = PIECE_VALUES['Rook']
+# Late move reductions apply to quiet moves after the first few, reducing
+# more the deeper the node and the later the move. Moves with a good history
+# score are reduced one ply less
+LMR_MIN_DEPTH = 3
+LMR_FULL_DEPTH_MOVES = 3
+LMR_GOOD_HISTORY = 512
+LMR_REDUCTIONS = [[int(0.5 + math.log(depth)*math.log(move_number)/2)
+                   if depth and move_number else 0
+                   for move_number in range(64)] for depth in range(64)]
+# Margins (in centipawns) by remaining depth for futility pruning of quiet
+# moves and for razoring straight into the quiescence search
+FUTILITY_MARGINS = (0, 200, 500)
+RAZORING_MARGINS = (0, 300, 550)
+
+# Any limit left as None doesn't apply. With no limits the search runs until
+# MAX_DEPTH or until it is stopped
+SearchLimits = namedtuple('SearchLimits', 'depth nodes time',
+                          defaults=(None, None, None))
+# Switches for the selective search features, all on by default
+SearchFeatures = namedtuple('SearchFeatures', 'null_move '
+                            'late_move_reductions futility_pruning razoring',
+                            defaults=(True, True, True, True))
+# Counts of what the search did, for benchmarking the search features
+SearchStats = namedtuple('SearchStats', 'nodes quiescence_nodes '
+                         'pruned_captures null_move_cutoffs razored_nodes '
+                         'futility_pruned_moves reduced_moves re_searches')
+# The result of a search. The score is in centipawns for the side to move
+SearchResult = namedtuple('SearchResult', 'best_move score depth nodes '
+                          'seconds nodes_per_second principal_variation')
+
+
+class SearchStopped(Exception):
+    """Raised inside the search when a limit is hit or a stop is requested"""
+
+
+def score_to_text(score):
+    """Changes a score into text like 'cp 35' or 'mate -3' (in moves)"""
+    if score > MATE_THRESHOLD:
+        return f'mate {(MATE_SCORE - score + 1)//2}'
+    if score < -MATE_THRESHOLD:
+        return f'mate {-((MATE_SCORE + score)//2)}'
+    return f'cp {score}'
+
+
+class Engine():
+    """Class that searches a board for the best move using negamax
+    alpha-beta with iterative deepening. Results are cached in a
+    transposition table that is kept from one search to the next. The
+    selective search features can be switched on and off"""
+    def __init__(self, hash_size_mb=16, features=SearchFeatures()):
+        # Instance variables
+        self.transposition_table = TranspositionTable(hash_size_mb)
+        self.move_orderer = MoveOrderer()
+        self.pawn_hash_table = PawnHashTable()
+        self.features = features
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.pruned_captures = 0
+        self.null_move_cutoffs = 0
+        self.razored_nodes = 0
+        self.futility_pruned_moves = 0
+        self.reduced_moves = 0
+        self.re_searches = 0
+        self._stop_event = threading.Event()
+        self._limits = SearchLimits()
+        self._start_time = 0.0
+        self._deadline = None
+        self._principal_variations = [[] for _ in range(MAX_DEPTH + 1)]
+
+    def stop(self):
+        """Asks a running search to stop as soon as possible. Safe to call
+        from another thread"""
+        self._stop_event.set()
+
+    def clear(self):
+        """Forgets everything learned in earlier searches"""
+        self.transposition_table.clear()
+        self.move_orderer = MoveOrderer()
+
+    def quiescence_score(self, board, alpha=-INFINITY, beta=INFINITY):
+        """Returns the score of the position for the side to move from the
+        quiescence search alone. Scores outside the window are bounds"""
+        self._stop_event = threading.Event()
+        self._limits = SearchLimits()
+        self._deadline = None
+        self._reset_stats()
+        return self._quiescence(board, alpha, beta, 0)
+
+    def return_stats(self):
+        """Returns the counts of what the last search did"""
+        return SearchStats(self.nodes, self.quiescence_nodes,
+                           self.pruned_captures, self.null_move_cutoffs,
+                           self.razored_nodes, self.futility_pruned_moves,
+                           self.reduced_moves, self.re_searches)
+
+    def _reset_stats(self):
+        """Sets all the search counts back to zero"""
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.pruned_captures = 0
+        self.null_move_cutoffs = 0
+        self.razored_nodes = 0
+        self.futility_pruned_moves = 0
+        self.reduced_moves = 0
+        self.re_searches = 0
+
+    def search(self, board, limits=SearchLimits(), info_callback=None,
+               alpha=-INFINITY, beta=INFINITY, stop_event=None):
+        """Searches the board within the passed limits and returns the
+        result of the deepest completed iteration. The info callback (if
+        any) is called with the result of every completed iteration. Every
+        iteration is searched with the alpha-beta window, so a score at or
+        outside it is only a bound. The search stops early once the stop
+        event (a new one if none is passed) is set, which lets another
+        thread stop it before it has even started. The board is left as it
+        was passed"""
+        if stop_event is None:
+            stop_event = threading.Event()
+        self._stop_event = stop_event
+        self._limits = limits
+        self._reset_stats()
+        self._start_time = time.perf_counter()
+        self._deadline = None
+        if limits.time is not None:
+            self._deadline = self._start_time + limits.time
+        self.transposition_table.new_search()
+        self.move_orderer.new_search()
+        # At least one iteration is always searched so there is a move
+        max_depth = MAX_DEPTH
+        if limits.depth is not None:
+            max_depth = max(1, min(limits.depth, MAX_DEPTH))
+        history_length = len(board.move_history)
+
+        root_moves = board.legal_moves()
+        if not root_moves:
+            score = -MATE_SCORE if board.is_king_attacked(board.turn_color) \
+                else 0
+            return SearchResult(None, score, 0, 0, 0.0, 0.0, [])
+        result = SearchResult(root_moves[0], 0, 0, 0, 0.0, 0.0,
+                              [root_moves[0]])
+
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(board, depth, alpha, beta, 0)
+            except SearchStopped:
+                # Take back the moves of the unfinished iteration
+                while len(board.move_history) > history_length:
+                    board.unmake_move()
+                break
+            # No move beats alpha when the iteration fails low
+            principal_variation = list(self._principal_variations[0]) or \
+                [result.best_move]
+            seconds = time.perf_counter() - self._start_time
+            result = SearchResult(principal_variation[0], score, depth,
+                                  self.nodes, seconds,
+                                  self.nodes/seconds if seconds else 0.0,
+                                  principal_variation)
+            logging.debug(f'Depth {depth} score {score_to_text(score)} '
+                          f'nodes {self.nodes} pv ' +
+                          ' '.join(map(move_to_text, principal_variation)))
+            if info_callback is not None:
+                info_callback(result)
+            if abs(score) > MATE_THRESHOLD or stop_event.is_set():
+                break
+            if self._deadline is not None and seconds > \
+                    limits.time*ITERATION_TIME_FRACTION:
+                break
+
+        # Report the nodes and time of the whole search
+        seconds = time.perf_counter() - self._start_time
+        return result._replace(nodes=self.nodes, seconds=seconds,
+                               nodes_per_second=self.nodes/seconds
+                               if seconds else 0.0)
+
+    def _check_limits(self):
+        """Raises SearchStopped if the search has to stop"""
+        if self._stop_event.is_set():
+            raise SearchStopped()
+        if self._limits.nodes is not None and \
+                self.nodes >= self._limits.nodes:
+            raise SearchStopped()
+        if self._deadline is not None and \
+                self.nodes % NODES_PER_TIME_CHECK == 0 and \
+                time.perf_counter() >= self._deadline:
+            raise SearchStopped()
+
+    def _negamax(self, board, depth, alpha, beta, ply,
+                 null_move_allowed=True):
+        """Returns the score of the position for the side to move searched
+        to the passed depth and fills in the principal variation for the
+        ply. Nodes searched with a zero width window can be pruned"""
+        self.nodes += 1
+        self._check_limits()
+        principal_variation = self._principal_variations[ply]
+        principal_variation.clear()
+        # A repeat of any earlier position is scored as a draw since either
+        # side could keep repeating it
+        if ply > 0 and (board.is_repetition(2) or
+                        board.is_fifty_move_draw()):
+            return 0
+        if depth <= 0 or ply >= MAX_DEPTH:
+            return self._quiescence(board, alpha, beta, ply)
+        principal_variation_node = beta - alpha > 1
+
+        # Use the stored result if it was searched at least as deep
+        key = board.zobrist_key
+        entry = self.transposition_table.probe(key)
+        hash_move = None
+        if entry is not None:
+            hash_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                score = self._score_from_table(entry.score, ply)
+                if entry.bound == EXACT or \
+                        (entry.bound == LOWER_BOUND and score >= beta) or \
+                        (entry.bound == UPPER_BOUND and score <= alpha):
+                    if hash_move is not None:
+                        principal_variation.append(hash_move)
+                    return score
+
+        color = board.turn_color
+        in_check = board.is_king_attacked(color)
+        features = self.features
+        futile = False
+        if not principal_variation_node and not in_check:
+            static_score = evaluate(board, self.pawn_hash_table)
+            if features.razoring and depth < len(RAZORING_MARGINS) and \
+                    static_score + RAZORING_MARGINS[depth] < alpha:
+                # Hopeless nodes drop straight into the quiescence search
+                score = self._quiescence(board, alpha, alpha + 1, ply)
+                if score <= alpha:
+                    self.razored_nodes += 1
+                    return score
+            if features.null_move and null_move_allowed and \
+                    depth >= NULL_MOVE_MIN_DEPTH and static_score >= beta and \
+                    abs(beta) < MATE_THRESHOLD:
+                score = self._null_move_search(board, depth, beta, ply)
+                if score is not None:
+                    return score
+            futile = features.futility_pruning and \
+                depth < len(FUTILITY_MARGINS) and \
+                abs(alpha) < MATE_THRESHOLD and \
+                static_score + FUTILITY_MARGINS[depth] <= alpha
+
+        moves = board.legal_moves()
+        if not moves:
+            if in_check:
+                return -MATE_SCORE + ply
+            return 0
+        moves = self.move_orderer.order_moves(board, moves, hash_move, ply)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move_number, move in enumerate(moves):
+            quiet = move_number > 0 and is_quiet(board, move)
+            late_move = quiet and features.late_move_reductions and \
+                not in_check and depth >= LMR_MIN_DEPTH and \
+                move_number >= LMR_FULL_DEPTH_MOVES and \
+                not self.move_orderer.is_killer(move, ply)
+            board.make_move(move)
+            gives_check = (futile or late_move) and \
+                board.is_king_attacked(board.turn_color)
+            if futile and quiet and not gives_check:
+                # Quiet moves can't make up the margin this close to the
+                # horizon
+                board.unmake_move()
+                self.futility_pruned_moves += 1
+                continue
+
+            if move_number == 0:
+                score = -self._negamax(board, depth - 1, -beta, -alpha,
+                                       ply + 1)
+            else:
+                reduction = 0
+                if late_move and not gives_check:
+                    reduction = LMR_REDUCTIONS[min(depth, 63)][
+                        min(move_number, 63)]
+                    if principal_variation_node:
+                        reduction -= 1
+                    if self.move_orderer.history_score(color, move) >= \
+                            LMR_GOOD_HISTORY:
+                        reduction -= 1
+                    reduction = max(0, min(reduction, depth - 2))
+                    if reduction:
+                        self.reduced_moves += 1
+                # Later moves are searched with a zero width window first to
+                # prove they are no better than the best move so far
+                score = -self._negamax(board, depth - 1 - reduction,
+                                       -alpha - 1, -alpha, ply + 1)
+                if score > alpha and reduction:
+                    self.re_searches += 1
+                    score = -self._negamax(board, depth - 1, -alpha - 1,
+                                           -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._negamax(board, depth - 1, -beta, -alpha,
+                                           ply + 1)
+            board.unmake_move()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    principal_variation[:] = [move] + \
+                        self._principal_variations[ply + 1]
+                    if score >= beta:
+                        self.move_orderer.record_cutoff(board, move, depth,
+                                                        ply, move_number)
+                        break
+
+        if best_score >= beta:
+            bound = LOWER_BOUND
+        elif best_score > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER_BOUND
+        self.transposition_table.store(key, depth,
+                                       self._score_to_table(best_score, ply),
+                                       bound, best_move)
+        return best_score
+
+    def _null_move_search(self, board, depth, beta, ply):
+        """Passes the turn and searches the position shallower. Returns a
+        score to cut off with if the side to move is still at least beta
+        ahead (or None). Positions without non-pawn material are skipped
+        and ones with little of it are verified since passing could be
+        better than any real move there"""
+        material = non_pawn_material(board, board.turn_color)
+        if not material:
+            return None
+        reduction = NULL_MOVE_REDUCTION
+        if depth >= NULL_MOVE_DEEP_DEPTH:
+            reduction += 1
+        board.make_null_move()
+        score = -self._negamax(board, depth - 1 - reduction, -beta,
+                               -beta + 1, ply + 1, False)
+        board.unmake_move()
+        if score < beta:
+            return None
+        if material <= NULL_MOVE_VERIFICATION_MATERIAL:
+            score = self._negamax(board, depth - reduction, beta - 1, beta,
+                                  ply, False)
+            if score < beta:
+                return None
+        self.null_move_cutoffs += 1
+        # Mate scores found after passing can't be trusted
+        return min(score, MATE_THRESHOLD)
+
+    def _quiescence(self, board, alpha, beta, ply):
+        """Returns the score of the position for the side to move once the
+        captures have played out. The side to move can stand pat on the
+        static evaluation unless it is in check, and captures that lose
+        material by static exchange evaluation aren't searched"""
+        self.nodes += 1
+        self.quiescence_nodes += 1
+        self._check_limits()
+        self._principal_variations[ply].clear()
+        if ply >= MAX_DEPTH:
+            return evaluate(board, self.pawn_hash_table)
+
+        color = board.turn_color
+        in_check = board.is_king_attacked(color)
+        if in_check:
+            # Every way out of check has to be searched
+            moves = board.legal_moves()
+            if not moves:
+                return -MATE_SCORE + ply
+            best_score = -INFINITY
+        else:
+            best_score = evaluate(board, self.pawn_hash_table)
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            moves = board.generate_captures()
+        moves = self.move_orderer.order_moves(board, moves, ply=ply)
+
+        for move in moves:
+            if not in_check and static_exchange(board, move) < 0:
+                self.pruned_captures += 1
+                continue
+            board.make_move(move)
+            if not in_check and board.is_king_attacked(color):
+                board.unmake_move()
+                continue
+            score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if score >= beta:
+                        break
+        return best_score
+
+    @staticmethod
+    def _score_to_table(score, ply):
+        """Changes a mate score from distance to the root into distance to
+        the node so it stays right wherever the position is reached"""
+        if score > MATE_THRESHOLD:
+            return score + ply
+        if score < -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_table(score, ply):
+        """Changes a stored mate score back into distance to the root"""
+        if score > MATE_THRESHOLD:
+            return score - ply
+        if score < -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+
+def main(arguments=None):
+    """Searches a position and prints each iteration and the best move"""
+    parser = argparse.ArgumentParser(description='Search a chess position '
+                                     'for the best move')
+    parser.add_argument('--fen', default=STARTING_FEN,
+                        help='position to search')
+    parser.add_argument('--depth', type=int, help='maximum search depth')
+    parser.add_argument('--nodes', type=int, help='maximum number of nodes')
+    parser.add_argument('--time', type=float,
+                        help='maximum search time in seconds')
+    parser.add_argument('--hash', type=int, default=16,
+                        help='transposition table size in MB')
+    parser.add_argument('--no-null-move', action='store_true',
+                        help='turn off null move pruning')
+    parser.add_argument('--no-lmr', action='store_true',
+                        help='turn off late move reductions')
+    parser.add_argument('--no-futility', action='store_true',
+                        help='turn off futility pruning')
+    parser.add_argument('--no-razoring', action='store_true',
+                        help='turn off razoring')
+    arguments = parser.parse_args(arguments)
+    logging.basicConfig(
+        format='[%(asctime)s] %(levelname)s : %(funcName)s() - %(message)s',
+        level=logging.WARNING)
+
+    limits = SearchLimits(arguments.depth, arguments.nodes, arguments.time)
+    if limits == SearchLimits():
+        limits = SearchLimits(depth=4)
+
+    def print_iteration(result):
+        print(f'depth {result.depth}  score {score_to_text(result.score)}  '
+              f'nodes {result.nodes}  time {result.seconds:.3f}s  pv '
+              f'{" ".join(map(move_to_text, result.principal_variation))}')
+
+    features = SearchFeatures(not arguments.no_null_move,
+                              not arguments.no_lmr,
+                              not arguments.no_futility,
+                              not arguments.no_razoring)
+    engine = Engine(arguments.hash, features)
+    result = engine.search(Board(fen=arguments.fen), limits, print_iteration)
+    if result.best_move is None:
+        print('no legal moves')
+        return 0
+    print(f'bestmove {move_to_text(result.best_move)}  '
+          f'{result.nodes_per_second:.0f} nodes/s  first move cutoffs '
+          f'{engine.move_orderer.first_move_cutoff_rate():.1%}')
+    for name, count in engine.return_stats()._asdict().items():
+        print(f'{name.replace("_", " ")}: {count}')
+    pawn_hash_stats = engine.pawn_hash_table.return_stats()
+    print(f'pawn hash hits: {pawn_hash_stats.hits}  '
+          f'misses: {pawn_hash_stats.misses}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Running engine searches in the background
+
+Created on Mon Oct 19 04:12:37 2026
+
+@author: danielb
+"""
+
+import logging
+import queue
+import threading
+from collections import namedtuple
+from functools import partial
+from engine import Engine, SearchFeatures, SearchLimits, score_to_text
+from helpful_functions import move_to_text
+from parallel_search import rebuild_board, return_position
+
+# Message kinds. INFO carries the result of a completed iteration and
+# BEST_MOVE the final result of the search
+INFO = 'info'
+BEST_MOVE = 'bestmove'
+
+# A message from the search thread. The search id says which search it came
+# from so messages from cancelled searches can be dropped
+EngineMessage = namedtuple('EngineMessage', 'kind search_id result')
+
+
+class EngineWorker():
+    """Class that runs engine searches on a background thread so whatever
+    started them (like the Tk mainloop) carries on straight away. Progress
+    and the best move are put on a thread-safe queue which is read with
+    poll, so all of the results are handled on the caller's own thread. The
+    search works on its own copy of the board"""
+    def __init__(self, hash_size_mb=16, features=SearchFeatures()):
+        # Instance variables
+        self.engine = Engine(hash_size_mb, features)
+        self.search_id = 0
+        self._messages = queue.Queue()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def is_searching(self):
+        """Returns True while a search is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, board, limits=SearchLimits()):
+        """Starts searching the board's position within the limits,
+        cancelling any search already running. Returns the id the new
+        search's messages will have"""
+        self.cancel()
+        self.search_id += 1
+        # Each search gets its own stop event so a stop sent before the
+        # thread gets going still counts
+        self._stop_event = threading.Event()
+        # Pass the moves as well as the FEN so repetitions are seen
+        fen, moves = return_position(board)
+        self._thread = threading.Thread(
+            target=self._search,
+            args=(self.search_id, fen, moves, limits, self._stop_event),
+            name=f'engine-search-{self.search_id}', daemon=True)
+        self._thread.start()
+        return self.search_id
+
+    def stop(self):
+        """Asks the running search to finish now. Its best move so far still
+        arrives as a BEST_MOVE message"""
+        self._stop_event.set()
+
+    def cancel(self):
+        """Stops the running search and drops all of its messages"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.search_id += 1
+        self.poll()
+
+    def poll(self):
+        """Returns the messages of the current search that have arrived
+        since the last poll without waiting for any more"""
+        messages = []
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return messages
+            if message.search_id == self.search_id:
+                messages.append(message)
+
+    def _search(self, search_id, fen, moves, limits, stop_event):
+        """Searches the position on the worker thread and queues the result
+        of every iteration and the final result"""
+        board = rebuild_board(fen, moves)
+        result = self.engine.search(board, limits,
+                                    partial(self._queue_info, search_id),
+                                    stop_event=stop_event)
+        if result.best_move is not None:
+            logging.info(f'Engine search {search_id} finished at depth '
+                         f'{result.depth} with best move '
+                         f'{move_to_text(result.best_move)}')
+        self._messages.put(EngineMessage(BEST_MOVE, search_id, result))
+
+    def _queue_info(self, search_id, result):
+        """Queues the result of a completed iteration"""
+        logging.debug(f'Engine search {search_id} depth {result.depth} score '
+                      f'{score_to_text(result.score)}')
+        self._messages.put(EngineMessage(INFO, search_id, result))
@@ -0,0 +1,261 @@
+"""
+Static evaluation of chess positions
+
+Created on Sun Oct 18 22:58:04 2026
+
+@author: danielb
+"""
+
+from pawn_structure import evaluate_pawn_structure
+
+WHITE = 'White'
+BLACK = 'Black'
+BISHOP = 'Bishop'
+KING = 'King'
+KNIGHT = 'Knight'
+PAWN = 'Pawn'
+QUEEN = 'Queen'
+ROOK = 'Rook'
+
+# Piece values in centipawns. The king is never traded so it counts nothing
+PIECE_VALUES = {
+    BISHOP: 330,
+    KING: 0,
+    KNIGHT: 320,
+    PAWN: 100,
+    QUEEN: 900,
+    ROOK: 500
+    }
+# Pieces are worth a little different once most of the pieces are gone
+ENDGAME_VALUES = {
+    BISHOP: 320,
+    KING: 0,
+    KNIGHT: 300,
+    PAWN: 120,
+    QUEEN: 900,
+    ROOK: 530
+    }
+
+# Game phase weight of each piece. The phase counts down from MAX_PHASE with
+# every piece on the board to 0 with only kings and pawns left
+PHASE_WEIGHTS = {
+    BISHOP: 1,
+    KING: 0,
+    KNIGHT: 1,
+    PAWN: 0,
+    QUEEN: 4,
+    ROOK: 2
+    }
+MAX_PHASE = 24
+
+# Piece-square tables in centipawns for the middlegame and the endgame. They
+# are laid out as the board looks from white's side, with the 8th row first
+MIDDLEGAME_TABLES = {
+    PAWN: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0),
+    KNIGHT: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50),
+    BISHOP: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20),
+    ROOK: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0),
+    QUEEN: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20),
+    KING: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20)
+    }
+ENDGAME_TABLES = dict(MIDDLEGAME_TABLES, **{
+    PAWN: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        80, 80, 80, 80, 80, 80, 80, 80,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        30, 30, 30, 30, 30, 30, 30, 30,
+        20, 20, 20, 20, 20, 20, 20, 20,
+        10, 10, 10, 10, 10, 10, 10, 10,
+        10, 10, 10, 10, 10, 10, 10, 10,
+        0, 0, 0, 0, 0, 0, 0, 0),
+    ROOK: (0,)*64,
+    KING: (
+        -50, -40, -30, -20, -20, -30, -40, -50,
+        -30, -20, -10, 0, 0, -10, -20, -30,
+        -30, -10, 20, 30, 30, 20, -10, -30,
+        -30, -10, 30, 40, 40, 30, -10, -30,
+        -30, -10, 30, 40, 40, 30, -10, -30,
+        -30, -10, 20, 30, 30, 20, -10, -30,
+        -30, -30, 0, 0, 0, 0, -30, -30,
+        -50, -30, -30, -30, -30, -30, -30, -50)
+    })
+
+
+def _square_scores(values, tables):
+    """Returns the score of every piece on every square (value plus piece
+    square table) indexed by color, piece type and square index. Black's
+    scores are mirrored and negative so the totals are from white's side"""
+    square_scores = {WHITE: {}, BLACK: {}}
+    for piece_type, table in tables.items():
+        # Square index 0 (1a) is the first square of the last table row
+        square_scores[WHITE][piece_type] = tuple(
+            values[piece_type] + table[square ^ 56] for square in range(64))
+        square_scores[BLACK][piece_type] = tuple(
+            -values[piece_type] - table[square] for square in range(64))
+    return square_scores
+
+
+# Kept up to date by the board as pieces are added, removed and moved
+MIDDLEGAME_SQUARE_SCORES = _square_scores(PIECE_VALUES, MIDDLEGAME_TABLES)
+ENDGAME_SQUARE_SCORES = _square_scores(ENDGAME_VALUES, ENDGAME_TABLES)
+
+
+def material(board, color):
+    """Returns the total value of the passed color's pieces"""
+    bitboards = board.piece_bitboards[color]
+    return sum(PIECE_VALUES[piece_type]*bitboard.bit_count()
+               for piece_type, bitboard in bitboards.items())
+
+
+def non_pawn_material(board, color):
+    """Returns the total value of the passed color's pieces other than
+    pawns. Positions with little of it are prone to zugzwang"""
+    bitboards = board.piece_bitboards[color]
+    return sum(PIECE_VALUES[piece_type]*bitboard.bit_count()
+               for piece_type, bitboard in bitboards.items()
+               if piece_type != PAWN)
+
+
+def compute_scores(board):
+    """Works out the middlegame score, endgame score and game phase of the
+    position from scratch. The board normally keeps them up to date as
+    moves are made instead"""
+    middlegame_score = 0
+    endgame_score = 0
+    phase = 0
+    for piece in board.pieces:
+        middlegame_score += MIDDLEGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type][piece.position]
+        endgame_score += ENDGAME_SQUARE_SCORES[piece.color][
+            piece.piece_type][piece.position]
+        phase += PHASE_WEIGHTS[piece.piece_type]
+    return middlegame_score, endgame_score, phase
+
+
+def evaluate(board, pawn_hash_table=None):
+    """Returns the score of the position in centipawns from the point of
+    view of the side to move. The middlegame and endgame scores the board
+    keeps up to date plus the pawn structure scores are blended by how many
+    pieces are left. The pawn structure is looked up in the pawn hash table
+    if one is passed"""
+    if pawn_hash_table is None:
+        pawn_entry = evaluate_pawn_structure(
+            board.piece_bitboards[WHITE][PAWN],
+            board.piece_bitboards[BLACK][PAWN])
+    else:
+        pawn_entry = pawn_hash_table.lookup(board)
+    phase = min(board.phase, MAX_PHASE)
+    score = ((board.middlegame_score + pawn_entry.middlegame_score)*phase +
+             (board.endgame_score + pawn_entry.endgame_score) *
+             (MAX_PHASE - phase))//MAX_PHASE
+    if board.turn_color == WHITE:
+        return score
+    return -score
+
+
+# Piece values for static exchange evaluation. Capturing with the king
+# costs so much that it only pays off if nothing can recapture
+EXCHANGE_VALUES = dict(PIECE_VALUES, **{KING: 20000})
+# Attackers are tried from the least valuable up
+EXCHANGE_ORDER = (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+
+
+def static_exchange(board, move):
+    """Returns the material won (in centipawns) by the side to move if the
+    move starts a series of captures on its end square, with each side
+    recapturing with its least valuable piece for as long as it pays to"""
+    start, end, promotion = move
+    piece = board.squares[start]
+    victim = board.squares[end]
+    occupied = board.occupancy[WHITE] | board.occupancy[BLACK]
+    gains = [0]
+    if victim is not None:
+        gains[0] = EXCHANGE_VALUES[victim.piece_type]
+    elif piece.piece_type == PAWN and end == board.en_passant_square:
+        # Take the pawn captured en passant off the board
+        gains[0] = EXCHANGE_VALUES[PAWN]
+        if piece.color == WHITE:
+            occupied ^= 1 << (end - 8)
+        else:
+            occupied ^= 1 << (end + 8)
+    attacker_type = piece.piece_type
+    if promotion is not None:
+        gains[0] += EXCHANGE_VALUES[promotion] - EXCHANGE_VALUES[PAWN]
+        attacker_type = promotion
+    from_bit = 1 << start
+    if piece.color == WHITE:
+        side = BLACK
+    else:
+        side = WHITE
+
+    while True:
+        # Score the piece now on the square being captured in return
+        gains.append(EXCHANGE_VALUES[attacker_type] - gains[-1])
+        # Removing the last capturer uncovers any slider behind it
+        occupied ^= from_bit
+        attackers = board.attackers_to(end, occupied) & occupied & \
+            board.occupancy[side]
+        if not attackers:
+            break
+        for attacker_type in EXCHANGE_ORDER:
+            bitboard = attackers & board.piece_bitboards[side][attacker_type]
+            if bitboard:
+                from_bit = bitboard & -bitboard
+                break
+        if side == WHITE:
+            side = BLACK
+        else:
+            side = WHITE
+
+    # Either side can stop capturing when carrying on would lose material
+    for index in range(len(gains) - 2, 0, -1):
+        gains[index - 1] = -max(-gains[index - 1], gains[index])
+    return gains[0]
@@ -4,11 +4,12 @@ Created on Sun Dec 22 16:38:22 2019
 @author: danielb
 """
 
-from tkinter import Button
 import logging
+from board import Board
 from chess_displays import BoardDisplay, PromotionDisplay, TurnDisplay
-from chess_pieces import Bishop, King, Knight, Pawn, Queen, Rook
-from helpful_dictionaries import tile_positions
+from engine import SearchLimits, score_to_text
+from engine_worker import BEST_MOVE, INFO, EngineWorker
+from helpful_functions import index_to_square, move_to_text
 
 WHITE = 'White'
 BLACK = 'Black'
@@ -18,107 +19,96 @@ KNIGHT = 'Knight'
 PAWN = 'Pawn'
 QUEEN = 'Queen'
 ROOK = 'Rook'
-BUTTON_SIZE = 50
-COLUMNS = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
-ROWS = (1, 2, 3, 4, 5, 6, 7, 8)
+# How often the engine's messages are checked for in milliseconds
+ENGINE_POLL_INTERVAL = 50
 
 
 class Game():
-    """Class that represents a running of the game"""
-    def __init__(self):
+    """Class that represents a running of the game. The position and rules
+    live in the Board and this class only displays them. The computer can
+    play one of the colors, searching on a background thread so the display
+    never waits for it. Pressing Escape makes it move straight away and
+    pressing Delete cancels its search so the user plays its move instead"""
+    def __init__(self, computer_color=None, think_time=1.0):
         # Instance variables
+        self._board = Board()
         self._display = BoardDisplay()
         self._turn_display = TurnDisplay()
         self._promotion_display = None
-        self._pieces = []
-        self._possible_move_buttons = []
-        self._turn_color = WHITE
-        self._last_moved_piece = None
-        self._last_move_was_pawn_jump = None
+        self._pending_promotion = None
+        self._possible_move_positions = set()
         self._previous_position_shown = None
+        self._computer_color = computer_color
+        self._think_time = think_time
+        self._engine_worker = None
+        # The id of the search being waited for and whether the user is
+        # playing the computer's move after cancelling its search
+        self._engine_search_id = None
+        self._computer_move_cancelled = False
+        if computer_color is not None:
+            self._engine_worker = EngineWorker()
         # Initialiation methods
-        self._create_pieces()
+        self._display.set_click_callback(self._square_clicked)
+        self._display.root.bind('<Escape>', self._stop_engine)
+        self._display.root.bind('<Delete>', self._cancel_engine)
+        self._display.show_board(self._board)
+        if self._board.turn_color == computer_color:
+            self._start_engine()
 
     def maintain_display(self):
         """Maintains the Tkinter display"""
         self._display.root.mainloop()
+        if self._engine_worker is not None:
+            self._engine_worker.cancel()
+
+    def _square_clicked(self, position):
+        """Moves the shown piece if one of its possible moves was clicked,
+        otherwise shows or hides the possible moves of the piece on the
+        clicked square"""
+        # Nothing can be moved while waiting for a promotion choice or for
+        # the computer
+        if self._pending_promotion is not None or \
+                (self._board.turn_color == self._computer_color and
+                 not self._computer_move_cancelled):
+            return
+        if position in self._possible_move_positions:
+            self._move_piece(
+                self._board.return_piece(self._previous_position_shown),
+                position)
+            return
+        piece = self._board.return_piece(position)
+        if piece is None:
+            self._clear_possible_moves()
+            self._previous_position_shown = None
+            return
+        self._display_possible_moves(piece)
 
-    def _create_pieces(self):
-        """Creates the chess piece objects and adds them to the board"""
-        # Add the main white pieces
-        for column in COLUMNS:
-            square_name = str(1) + column
-            if column == 'a' or column == 'h': # Rook starting points
-                piece = Rook(WHITE, square_name, self._display.root)
-            elif column == 'b' or column == 'g': # Knight starting points
-                piece = Knight(WHITE, square_name, self._display.root)
-            elif column == 'c' or column == 'f': # Bishop starting points
-                piece = Bishop(WHITE, square_name, self._display.root)
-            elif column == 'd': # Queen starting point
-                piece = Queen(WHITE, square_name, self._display.root)
-            elif column == 'e': # King starting point
-                piece = King(WHITE, square_name, self._display.root)
-            piece.button.bind('<ButtonRelease-1>',
-                              lambda event, arg1=piece:
-                              self._display_possible_moves(event, arg1))
-            self._pieces.append(piece)
-        # Then add the white pawns
-        for column in COLUMNS:
-            square_name = str(2) + column
-            piece = Pawn(WHITE, square_name, self._display.root)
-            piece.button.bind('<ButtonRelease-1>',
-                              lambda event, arg1=piece:
-                              self._display_possible_moves(event, arg1))
-            self._pieces.append(piece)
-
-        # Add the main black pieces
-        for column in COLUMNS:
-            square_name = str(8) + column
-            if column == 'a' or column == 'h': # Rook starting points
-                piece = Rook(BLACK, square_name, self._display.root)
-            elif column == 'b' or column == 'g': # Knight starting points
-                piece = Knight(BLACK, square_name, self._display.root)
-            elif column == 'c' or column == 'f': # Bishop starting points
-                piece = Bishop(BLACK, square_name, self._display.root)
-            elif column == 'd': # Queen starting point
-                piece = Queen(BLACK, square_name, self._display.root)
-            elif column == 'e': # King starting point
-                piece = King(BLACK, square_name, self._display.root)
-            piece.button.bind('<ButtonRelease-1>',
-                              lambda event, arg1=piece:
-                              self._display_possible_moves(event, arg1))
-            self._pieces.append(piece)
-        # Then add the black pawns
-        for column in COLUMNS:
-            square_name = str(7) + column
-            piece = Pawn(BLACK, square_name, self._display.root)
-            piece.button.bind('<ButtonRelease-1>',
-                              lambda event, arg1=piece:
-                              self._display_possible_moves(event, arg1))
-            self._pieces.append(piece)
-
-    def _display_possible_moves(self, event, piece):
+    def _display_possible_moves(self, piece):
         """Displays all possible moves for the piece in a given position"""
-        logging.debug(f'Button click event was {event}')
         # Don't show moves if it's not their turn
-        if piece.color != self._turn_color:
+        if piece.color != self._board.turn_color:
             self._clear_possible_moves()
             return
 
         # Show potential moves for a given square
         if piece.position != self._previous_position_shown:
             logging.info(f'Showing possible moves for the {piece.color} '
-                         f'{piece.piece_type} at {piece.position}')
-            if self._possible_move_buttons:
-                self._clear_possible_moves()
-            # Check potential moves for the piece
-            piece.check_potential_moves(self._return_squares())
-            for position in piece.possible_captures:
-                self._create_move_button(piece, position, 'Red')
-            for position in piece.possible_moves:
-                self._create_move_button(piece, position, 'Blue')
-            for position in piece.possible_special_moves:
-                self._create_move_button(piece, position, 'Blue')
+                         f'{piece.piece_type} at '
+                         f'{index_to_square(piece.position)}')
+            # The legal moves are shared with the board for the whole turn
+            # so clicking doesn't generate them again
+            hints = {}
+            for move in self._board.return_legal_moves():
+                if move.start != piece.position:
+                    continue
+                if self._board.return_piece(move.end) is not None or \
+                        (piece.piece_type == PAWN and
+                         move.end == self._board.en_passant_square):
+                    hints[move.end] = 'Red'
+                else:
+                    hints[move.end] = 'Blue'
+            self._display.show_hints(hints)
+            self._possible_move_positions = set(hints)
             self._previous_position_shown = piece.position
 
         # Stop showing the potential moves for a given square
@@ -129,202 +119,132 @@ class Game():
             self._previous_position_shown = None
 
     def _clear_possible_moves(self):
-        """Clears the possible move buttons"""
-        for button in self._possible_move_buttons:
-            button.destroy()
-        self._possible_move_buttons.clear()
-
-    def _create_move_button(self, piece, position, color):
-        """Creates the potential move button"""
-        button = Button(self._display.root, text='??',
-                        bg=color, fg='White', cursor='hand2')
-        button.bind('<ButtonRelease-1>',
-                    lambda event, arg1=piece, arg2=position:
-                    self._move_piece(event, arg1, arg2))
-        button.place(x=tile_positions[position].x,
-                     y=tile_positions[position].y,
-                     height=BUTTON_SIZE, width=BUTTON_SIZE)
-        self._possible_move_buttons.append(button)
-
-    def _remove_piece(self, piece):
-        """Removes the passed piece"""
-        logging.info(f'Removing the {piece.color} {piece.piece_type} at '
-                     f'{piece.position}')
-        piece.button.destroy()
-        self._pieces.remove(piece)
-        del piece
+        """Hides the possible move hints"""
+        self._display.clear_hints()
+        self._possible_move_positions.clear()
 
     def return_piece(self, position):
         """Returns the chess piece object from the passed position"""
-        for piece in self._pieces:
-            if piece.position == position:
-                return piece
-        return None
+        return self._board.return_piece(position)
 
-    def _return_squares(self):
-        """Returns a dictionary of square positions and their corresponding
-        chess piece (or None if there is no piece)"""
-        squares = {}
-        for row in ROWS:
-            for column in COLUMNS:
-                square_name = str(row) + column
-                squares[square_name] = None
-        for piece in self._pieces:
-            squares[piece.position] = piece
-        return squares
-
-    def _show_game_over(self, winning_color):
+    def _show_game_over(self, winning_color, result=None):
         """Changes the displays if the game is over"""
-        # Add the pieces but only with lables instead of buttons
-        for piece in self._pieces:
-            piece.disable_button(self._display.root)
+        # Leave the pieces showing but stop them reacting to clicks
+        self._display.disable()
 
-        self._turn_display.show_game_over_display(winning_color)
+        self._turn_display.show_game_over_display(winning_color, result)
 
-    def _move_piece(self, event, piece, new_position):
-        """Moves the chess piece to a new position and checks some conditions
-        after the move"""
-        logging.debug(f'Button click event was {event}')
+    def _move_piece(self, piece, new_position):
+        """Moves the chess piece to a new position, first asking for the
+        promotion piece if it's a pawn being promoted"""
         self._clear_possible_moves()
-        piece.check_potential_moves(self._return_squares())
-        # Check if this is a capture
-        captured_piece = None
-        if new_position in piece.possible_captures:
-            captured_piece = self.return_piece(new_position)
-            logging.info(f'The {captured_piece.color} {captured_piece.piece_type}'
-                         f'at position {new_position} will be captured!')
-            # Remove the piece being captured
-            self._remove_piece(captured_piece)
-
-        # Change the moving piece's location
-        logging.info(f'Moving the {piece.color} {piece.piece_type} from '
-                     f'{piece.position} to {new_position}')
-        piece.update_position(new_position)
+        self._previous_position_shown = None
 
-        # Check if the king was captured and, if so, end the game
-        if captured_piece is not None and captured_piece.piece_type == KING:
-            logging.info(f'The {captured_piece.color} king has just been '
-                         f'captured. The game is over.')
-            self._show_game_over(piece.color)
+        # Ask for the promotion piece first unless the king is being captured
+        target_piece = self._board.return_piece(new_position)
+        if self._board.is_promotion_move(piece, new_position) and \
+                (target_piece is None or target_piece.piece_type != KING):
+            logging.info(f'The {piece.color} {PAWN} moving to position '
+                         f'{index_to_square(new_position)} is up for '
+                         f'promotion')
+            self.promotion(piece, new_position)
             return
+        self._finish_move(piece, new_position)
 
-        # Check if the previous move deserves a promotion
-        if piece.piece_type == PAWN:
-            if piece.color == WHITE and new_position[0] == "8":
-                logging.info(f'The {WHITE} {PAWN} at position {new_position} '
-                             f'is up for promotion')
-                self.promotion(piece)
-            elif piece.color == BLACK and new_position[0] == "1":
-                logging.info(f'The {BLACK} {PAWN} at position {new_position} '
-                             f'is up for promotion')
-                self.promotion(piece)
-
-        # Check if the previous move was an En Passent or Castle
-        if new_position in piece.possible_special_moves:
-            # If it was a En Passent then capture the appropriate pawn
-            if piece.piece_type == PAWN:
-                if new_position not in piece.possible_captures:
-                    # Determine the position of the pawn being captured
-                    new_row = int(new_position[0])
-                    capture_column = new_position[1]
-                    if piece.color == WHITE:
-                        capture_row = new_row - 1
-                    elif piece.color == BLACK:
-                        capture_row = new_row + 1
-                    capture_position = str(capture_row) + capture_column
-                    captured_piece = self.return_piece(capture_position)
-                    self._remove_piece(captured_piece)
-
-            # If it was a Castle then move the appropriate rook
-            if piece.piece_type == KING:
-                # Figure out if the castle was a queen side or king side
-                if new_position[1] == 'c':
-                    if piece.color == WHITE:
-                        current_rook_position = '1a'
-                        new_rook_position = '1d'
-                    elif piece.color == BLACK:
-                        current_rook_position = '8a'
-                        new_rook_position = '8d'
-                    rook_piece = self.return_piece(current_rook_position)
-                    rook_piece.update_position(new_rook_position)
-                elif new_position[1] == 'g':
-                    if piece.color == WHITE:
-                        current_rook_position = '1h'
-                        new_rook_position = '1f'
-                    elif piece.color == BLACK:
-                        current_rook_position = '8h'
-                        new_rook_position = '8f'
-                    rook_piece = self.return_piece(current_rook_position)
-                    rook_piece.update_position(new_rook_position)
-
-        # Set the last moved piece
-        self._last_moved_piece = new_position
-
-        # See if the move was a pawn jumping
-        if piece.piece_type == PAWN:
-            if abs(int(piece.position[0]) - int(new_position[0])) == 2:
-                self._last_move_was_pawn_jump = new_position
-            else:
-                self._last_move_was_pawn_jump = None
-        else:
-            self._last_move_was_pawn_jump = None
-
-        # See if the piece has previously been moved and set flag
-        if not piece.has_been_moved:
-            piece.has_been_moved = True
-
-        # Update the turn color flag and display
-        # Pass a boolean for whether the opponent is now in check or not
-        self._update_turn_color(self._check_for_check())
+    def _finish_move(self, piece, new_position, promotion_type=None):
+        """Moves the chess piece to a new position and updates the displays
+        after the move"""
+        self._board.move_piece(piece, new_position, promotion_type)
+        self._computer_move_cancelled = False
+        self._display.show_board(self._board)
+
+        # Check if the game is over by checkmate, stalemate or the king
+        # being captured
+        if self._board.winner is not None or self._board.result is not None:
+            self._show_game_over(self._board.winner, self._board.result)
+            return
 
-    def promotion(self, piece):
-        """Completes pawn promotion by creating a promotion """
-        self._promotion_display = PromotionDisplay()
-        # Wait for the user input
-        logging.info('Waiting')
-        self._display.root.wait_window(self._promotion_display.root)
-        logging.info('Finished waiting')
+        # Update the turn display with whether the player is now in check
+        self._turn_display.update_turn_display(self._board.turn_color,
+                                               self._board.in_check)
+        if self._board.turn_color == self._computer_color:
+            self._start_engine()
+
+    def promotion(self, piece, new_position):
+        """Asks the user which piece a promoting pawn should become without
+        waiting for the answer. The move is finished once a piece is chosen
+        or the window is closed"""
+        self._pending_promotion = (piece, new_position)
+        self._promotion_display = PromotionDisplay(self._promotion_chosen)
+
+    def _promotion_chosen(self, piece_type):
+        """Finishes the promotion move waiting on the passed piece type"""
         # If the user closed the window without choosing a piece then just
         # leave the pawn
-        if self._promotion_display.chosen_piece is None:
+        if piece_type is None:
             logging.info('No piece was chosen, leaving the pawn')
+        piece, new_position = self._pending_promotion
+        self._pending_promotion = None
+        self._promotion_display = None
+        self._finish_move(piece, new_position, piece_type)
+
+    def _start_engine(self):
+        """Starts the computer thinking about its move and starts checking
+        for its messages"""
+        logging.info(f'The computer is thinking for {self._board.turn_color}')
+        self._engine_search_id = self._engine_worker.start(
+            self._board, SearchLimits(time=self._think_time))
+        self._display.root.after(ENGINE_POLL_INTERVAL, self._poll_engine,
+                                 self._engine_search_id)
+
+    def _stop_engine(self, event):
+        """Makes the computer play the best move it has found so far"""
+        logging.debug(f'Key press event was {event}')
+        if self._engine_worker is not None:
+            self._engine_worker.stop()
+
+    def _cancel_engine(self, event):
+        """Cancels the computer's search and lets the user play its move"""
+        logging.debug(f'Key press event was {event}')
+        if self._engine_search_id is None:
             return
-        # Otherwise, change the piece out with the selected type
-        chosen_piece = self._promotion_display.chosen_piece
-        logging.info(chosen_piece)
-        if chosen_piece == QUEEN:
-            logging.info('HERE')
-            new_piece = Queen(piece.color, piece.position, self._display.root)
-        elif chosen_piece == KNIGHT:
-            new_piece = Knight(piece.color, piece.position, self._display.root)
-        elif chosen_piece == ROOK:
-            new_piece = Rook(piece.color, piece.position, self._display.root)
-        elif chosen_piece == BISHOP:
-            new_piece = Bishop(piece.color, piece.position, self._display.root)
-        # Remove the pawn and add the new piece
-        self._remove_piece(piece)
-        new_piece.button.bind('<ButtonRelease-1>',
-                              lambda event, arg1=new_piece:
-                              self._display_possible_moves(event, arg1))
-        self._pieces.append(new_piece)
-
-    def _update_turn_color(self, in_check):
-        """Updates the turn color display and instance variable"""
-        if self._turn_color == WHITE:
-            self._turn_color = BLACK
-        else:
-            self._turn_color = WHITE
-        self._turn_display.update_turn_display(self._turn_color, in_check)
-
-    def _check_for_check(self):
-        """Determines if the player is currently in check"""
-        squares = self._return_squares()
-        for piece in self._pieces:
-            if piece.color == self._turn_color:
-                piece.check_potential_moves(squares)
-                for move in piece.possible_captures:
-                    if squares[move].piece_type == KING:
-                        logging.info(f'The {squares[move].color} {KING} at '
-                                     f'position {move} is in check!')
-                        return True
-        return False
+        logging.info('The computer\'s search was cancelled')
+        self._engine_worker.cancel()
+        self._hand_move_to_user()
+
+    def _hand_move_to_user(self):
+        """Stops waiting for the computer and lets the user move for it"""
+        self._engine_search_id = None
+        self._computer_move_cancelled = True
+        self._turn_display.update_turn_display(self._board.turn_color,
+                                               self._board.in_check)
+
+    def _poll_engine(self, search_id):
+        """Shows the computer's progress and plays its move once it has
+        finished, otherwise checks again a little later. Polling stops once
+        the search is cancelled"""
+        if search_id != self._engine_search_id:
+            return
+        # Everything a finished search sends is queued before it ends, so
+        # it has to be looked for before giving up on the search
+        searching = self._engine_worker.is_searching()
+        for message in self._engine_worker.poll():
+            result = message.result
+            if message.kind == INFO:
+                self._turn_display.show_thinking(
+                    self._board.turn_color, result.depth,
+                    score_to_text(result.score))
+            elif message.kind == BEST_MOVE:
+                self._engine_search_id = None
+                move = result.best_move
+                logging.info(f'The computer played {move_to_text(move)}')
+                self._finish_move(self._board.return_piece(move.start),
+                                  move.end, move.promotion)
+                return
+        if not searching:
+            logging.error('The computer\'s search ended without a move')
+            self._hand_move_to_user()
+            self._turn_display.show_engine_error(self._board.turn_color)
+            return
+        self._display.root.after(ENGINE_POLL_INTERVAL, self._poll_engine,
+                                 search_id)
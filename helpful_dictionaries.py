@@ -24,6 +24,20 @@ text_color = {
         'White': 'Black'
         }
 
+# Dictionary with the piece type for each Forsyth-Edwards Notation letter
+fen_piece_types = {
+        'b': 'Bishop',
+        'k': 'King',
+        'n': 'Knight',
+        'p': 'Pawn',
+        'q': 'Queen',
+        'r': 'Rook'
+        }
+
+# Dictionary with the Forsyth-Edwards Notation letter for each piece type
+fen_letters = {piece_type: letter
+               for letter, piece_type in fen_piece_types.items()}
+
 # Dictionary with x and y positions based on tile name
 TileTuple = namedtuple('TileTuple', 'x y')
 tile_positions = {
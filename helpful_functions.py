@@ -5,33 +5,57 @@ Created on Sat Feb 23 18:34:07 2019
 @author: danielb
 """
 
+from helpful_dictionaries import fen_letters, fen_piece_types
+
+# Squares are numbered 0 to 63 starting with 1a, then 1b, up to 8h, so the
+# row is index // 8 and the column is index % 8
+COLUMN_LETTERS = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h')
+SQUARE_NAMES = tuple(str(row) + column for row in range(1, 9)
+                     for column in COLUMN_LETTERS)
+_SQUARE_INDEXES = {name: index for index, name in enumerate(SQUARE_NAMES)}
+_LETTER_INDEXES = {letter: index + 1
+                   for index, letter in enumerate(COLUMN_LETTERS)}
+
+
 def index_to_letter(number):
     """Changes a numerical index into its corresponding letter"""
-    indexKey = {
-        1: 'a',
-        2: 'b',
-        3: 'c',
-        4: 'd',
-        5: 'e',
-        6: 'f',
-        7: 'g',
-        8: 'h'
-        }
     if number < 1 or number > 8:
         return -1
     else:
-        return indexKey[number]
+        return COLUMN_LETTERS[number - 1]
 
 def letter_to_index(letter):
     """Changes a letter into its corresponding numerical index"""
-    letterKey = {
-        'a': 1,
-        'b': 2,
-        'c': 3,
-        'd': 4,
-        'e': 5,
-        'f': 6,
-        'g': 7,
-        'h': 8
-        }
-    return letterKey[letter]
\ No newline at end of file
+    return _LETTER_INDEXES[letter]
+
+def square_to_index(square_name):
+    """Changes a square name like '1a' into its square index (0 to 63)"""
+    return _SQUARE_INDEXES[square_name]
+
+def index_to_square(index):
+    """Changes a square index (0 to 63) into its square name like '1a'"""
+    return SQUARE_NAMES[index]
+
+def index_to_algebraic(index):
+    """Changes a square index (0 to 63) into its algebraic name like 'a1'"""
+    return COLUMN_LETTERS[index & 7] + str((index >> 3) + 1)
+
+def algebraic_to_index(algebraic_name):
+    """Changes an algebraic square name like 'a1' into its square index"""
+    return _SQUARE_INDEXES[algebraic_name[1] + algebraic_name[0]]
+
+def move_to_text(move):
+    """Changes a move into long algebraic text like 'e2e4' or 'e7e8q'"""
+    text = index_to_algebraic(move.start) + index_to_algebraic(move.end)
+    if move.promotion is not None:
+        text += fen_letters[move.promotion]
+    return text
+
+def text_to_squares(text):
+    """Changes long algebraic move text like 'e7e8q' into the start square
+    index, end square index and promotion piece type (or None)"""
+    promotion = None
+    if len(text) > 4:
+        promotion = fen_piece_types[text[4].lower()]
+    return algebraic_to_index(text[0:2]), algebraic_to_index(text[2:4]), \
+        promotion
@@ -0,0 +1,55 @@
+"""
+Positions and helper functions shared by the tests
+
+Created on Mon Oct 19 07:12:45 2026
+
+@author: danielb
+"""
+
+import time
+from engine_worker import BEST_MOVE
+from helpful_functions import square_to_index
+
+# White mates with the rook on the back row (a1a8)
+MATE_IN_ONE_FEN = '6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1'
+KIWIPETE_FEN = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R ' \
+    'w KQkq - 0 1'
+# How often the background searches are checked on in seconds
+POLL_INTERVAL = 0.01
+
+
+def play_moves(board, moves):
+    """Plays a list of moves given as pairs of square names"""
+    for start, end in moves:
+        board.move_piece(board.return_piece(square_to_index(start)),
+                         square_to_index(end))
+
+
+def poll_until(poll, is_done, timeout=5.0, failure_text='Timed out'):
+    """Calls poll until is_done returns True, failing the test if that
+    takes longer than the timeout"""
+    deadline = time.perf_counter() + timeout
+    while True:
+        poll()
+        if is_done():
+            return
+        if time.perf_counter() > deadline:
+            raise AssertionError(failure_text)
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_best_move(worker, timeout=5.0):
+    """Polls the worker like the display does until the search finishes and
+    returns all of the messages"""
+    messages = []
+    poll_until(lambda: messages.extend(worker.poll()),
+               lambda: messages and messages[-1].kind == BEST_MOVE,
+               timeout, 'The search did not finish')
+    return messages
+
+
+def wait_for_output(uci_engine, output, text, timeout=5.0):
+    """Reports the search until the text turns up in the output"""
+    poll_until(uci_engine.report_search,
+               lambda: text in output.getvalue(), timeout,
+               f'{text!r} was never sent')
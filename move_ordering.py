@@ -0,0 +1,156 @@
+"""
+Move ordering heuristics for the alpha-beta search
+
+Created on Sun Oct 18 23:44:09 2026
+
+@author: danielb
+"""
+
+from collections import namedtuple
+
+WHITE = 'White'
+BLACK = 'Black'
+BISHOP = 'Bishop'
+KING = 'King'
+KNIGHT = 'Knight'
+PAWN = 'Pawn'
+QUEEN = 'Queen'
+ROOK = 'Rook'
+
+# Piece ranks used for most valuable victim, least valuable attacker
+ORDERING_VALUES = {
+    PAWN: 1,
+    KNIGHT: 2,
+    BISHOP: 3,
+    ROOK: 4,
+    QUEEN: 5,
+    KING: 6
+    }
+MAX_PLY = 128
+KILLERS_PER_PLY = 2
+
+# Score bands so the hash move comes first, then captures and promotions,
+# then killer moves and finally quiet moves by their history score
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 27
+# History scores are halved once they reach this so they stay below the
+# killer moves
+MAX_HISTORY_SCORE = 1 << 26
+
+OrderingStats = namedtuple('OrderingStats', 'cutoffs first_move_cutoffs')
+
+
+def is_quiet(board, move):
+    """Returns True if the move is neither a capture nor a promotion"""
+    start, end, promotion = move
+    squares = board.squares
+    if squares[end] is not None or promotion is not None:
+        return False
+    return end != board.en_passant_square or \
+        squares[start].piece_type != PAWN
+
+
+class MoveOrderer():
+    """Class that sorts moves so the ones most likely to cause a cutoff are
+    searched first and learns from the cutoffs found while searching"""
+    def __init__(self):
+        # Instance variables
+        self.killers = [[None]*KILLERS_PER_PLY for _ in range(MAX_PLY)]
+        self.history = {WHITE: [0]*4096, BLACK: [0]*4096}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        """Forgets the killer moves, ages the history scores and resets the
+        counters for a new search"""
+        for killers in self.killers:
+            killers[:] = [None]*KILLERS_PER_PLY
+        for history in self.history.values():
+            for index, score in enumerate(history):
+                if score:
+                    history[index] = score >> 1
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def return_stats(self):
+        """Returns the number of cutoffs and how many came from the first
+        move searched"""
+        return OrderingStats(self.cutoffs, self.first_move_cutoffs)
+
+    def first_move_cutoff_rate(self):
+        """Returns the fraction of cutoffs caused by the first move"""
+        if not self.cutoffs:
+            return 0.0
+        return self.first_move_cutoffs/self.cutoffs
+
+    def history_score(self, color, move):
+        """Returns the history score of a quiet move for the passed color"""
+        return self.history[color][move.start << 6 | move.end]
+
+    def is_killer(self, move, ply):
+        """Returns True if the move is one of the killer moves of the ply"""
+        return move in self.killers[min(ply, MAX_PLY - 1)]
+
+    def capture_score(self, board, move):
+        """Returns the most valuable victim, least valuable attacker score
+        of a capture or promotion (or 0 for a quiet move)"""
+        start, end, promotion = move
+        squares = board.squares
+        victim = squares[end]
+        attacker = squares[start]
+        score = 0
+        if victim is not None:
+            score = ORDERING_VALUES[victim.piece_type]*8 - \
+                ORDERING_VALUES[attacker.piece_type]
+        elif end == board.en_passant_square and \
+                attacker.piece_type == PAWN:
+            score = ORDERING_VALUES[PAWN]*8 - ORDERING_VALUES[PAWN]
+        if promotion is not None:
+            score += ORDERING_VALUES[promotion]*8
+        return score
+
+    def order_moves(self, board, moves, hash_move=None, ply=0):
+        """Returns the moves sorted best first: the hash move, captures by
+        most valuable victim and least valuable attacker, killer moves and
+        then quiet moves by history score"""
+        killers = self.killers[min(ply, MAX_PLY - 1)]
+        history = self.history[board.turn_color]
+        scored_moves = []
+        for move in moves:
+            start, end, _ = move
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif not is_quiet(board, move):
+                score = CAPTURE_SCORE + self.capture_score(board, move)
+            elif move == killers[0]:
+                score = KILLER_SCORE + 1
+            elif move == killers[1]:
+                score = KILLER_SCORE
+            else:
+                score = history[start << 6 | end]
+            scored_moves.append((score, move))
+        scored_moves.sort(key=lambda scored_move: scored_move[0],
+                          reverse=True)
+        return [move for _, move in scored_moves]
+
+    def record_cutoff(self, board, move, depth, ply, move_number):
+        """Records a move that caused a beta cutoff at the passed depth and
+        ply. Quiet moves become killer moves and gain history score. The
+        board must still be in the position the move was played from"""
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+        if not is_quiet(board, move):
+            return
+        start, end, _ = move
+        killers = self.killers[min(ply, MAX_PLY - 1)]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history = self.history[board.turn_color]
+        index = start << 6 | end
+        history[index] += depth*depth
+        if history[index] >= MAX_HISTORY_SCORE:
+            for square_pair, score in enumerate(history):
+                history[square_pair] = score >> 1
@@ -0,0 +1,288 @@
+"""
+Searching the root moves of a position across several processes
+
+Created on Mon Oct 19 01:36:22 2026
+
+@author: danielb
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import namedtuple
+from board import Board, STARTING_FEN
+from engine import INFINITY, MATE_SCORE, MATE_THRESHOLD, Engine, \
+    SearchFeatures, SearchLimits, score_to_text
+from helpful_functions import move_to_text
+from move_ordering import MoveOrderer
+
+# What one worker process searched and how fast
+WorkerResult = namedtuple('WorkerResult', 'worker moves scores nodes '
+                          'seconds nodes_per_second')
+# The result of a parallel search. The score is in centipawns for the side
+# to move and move_scores has the score of every root move
+ParallelSearchResult = namedtuple('ParallelSearchResult', 'best_move score '
+                                  'depth nodes seconds nodes_per_second '
+                                  'principal_variation move_scores '
+                                  'worker_results')
+
+
+def return_position(board):
+    """Returns the FEN of the position the board's moves were played from
+    and the list of those moves, which together rebuild the board"""
+    moves = [record.move for record in board.move_history]
+    for _ in moves:
+        board.unmake_move()
+    fen = board.return_fen()
+    for move in moves:
+        if move is None:
+            board.make_null_move()
+        else:
+            board.make_move(move)
+    return fen, moves
+
+
+def rebuild_board(fen, moves):
+    """Returns a board set up from the FEN with the moves played on it"""
+    board = Board(fen=fen)
+    for move in moves:
+        if move is None:
+            board.make_null_move()
+        else:
+            board.make_move(move)
+    return board
+
+
+def _to_root_score(score):
+    """Changes a score of a position after a root move into the score of
+    the move for the side to move at the root"""
+    score = -score
+    if score > MATE_THRESHOLD:
+        score -= 1
+    elif score < -MATE_THRESHOLD:
+        score += 1
+    return score
+
+
+def _to_child_score(score):
+    """Changes a root score into the score of the position after the root
+    move, undoing _to_root_score"""
+    if score > MATE_THRESHOLD:
+        score += 1
+    elif score < -MATE_THRESHOLD:
+        score -= 1
+    return -score
+
+
+def _search_child(engine, board, depth, alpha, beta):
+    """Returns the score, principal variation and node count of the board
+    searched one ply shallower than the root with the window"""
+    if depth > 1:
+        result = engine.search(board, SearchLimits(depth=depth - 1),
+                               alpha=alpha, beta=beta)
+        return result.score, result.principal_variation, engine.nodes
+    return engine.quiescence_score(board, alpha, beta), [], engine.nodes
+
+
+def _search_root_move(engine, fen, history, move, depth, bound=None):
+    """Returns the score, principal variation and node count of one root
+    move searched to a fixed depth. With a bound the move is first only
+    tested with a zero window and fully searched if it beats the bound,
+    otherwise the score is an upper bound no higher than the bound. Every
+    move starts from a freshly built board and an empty transposition table
+    and move orderer so its score doesn't depend on which process searched
+    it"""
+    engine.clear()
+    board = rebuild_board(fen, history + [move])
+    # A root move that repeats a position or reaches the fifty move limit is
+    # a draw, as it is one ply into the serial search
+    if board.is_repetition(2) or board.is_fifty_move_draw():
+        return 0, [move], 0
+    nodes = 0
+    if bound is not None:
+        child_bound = _to_child_score(bound)
+        score, principal_variation, nodes = _search_child(
+            engine, board, depth, child_bound - 1, child_bound)
+        if score >= child_bound:
+            return _to_root_score(score), [move] + principal_variation, nodes
+    score, principal_variation, full_nodes = _search_child(
+        engine, board, depth, -INFINITY, INFINITY)
+    return _to_root_score(score), [move] + principal_variation, \
+        nodes + full_nodes
+
+
+# The engine of a worker process, built once by the pool's initializer
+_worker_engine = None
+
+
+def _start_worker(hash_size_mb, features):
+    """Builds the engine the worker process searches all of its moves
+    with"""
+    global _worker_engine
+    _worker_engine = Engine(hash_size_mb, features)
+
+
+def _search_root_moves(task):
+    """Searches each of the worker's root moves against the bound and
+    returns the worker's result with the principal variation of each
+    move"""
+    worker, fen, history, moves, depth, bound = task
+    engine = _worker_engine
+    scores = []
+    principal_variations = []
+    nodes = 0
+    start_time = time.perf_counter()
+    for move in moves:
+        score, principal_variation, move_nodes = _search_root_move(
+            engine, fen, history, move, depth, bound)
+        scores.append(score)
+        principal_variations.append(principal_variation)
+        nodes += move_nodes
+    seconds = time.perf_counter() - start_time
+    return WorkerResult(worker, moves, scores, nodes, seconds,
+                        nodes/seconds if seconds else 0.0), \
+        principal_variations
+
+
+class ParallelSearch():
+    """Class that splits the root moves of a position between a pool of
+    worker processes and searches them to a fixed depth. The first ordered
+    move is searched here with a full window and the workers only test the
+    rest against its score with a zero window, fully searching the ones
+    that beat it. The moves are dealt out in a fixed order and each is
+    searched from scratch, so the result only depends on the position and
+    depth and not on the number of workers or their timing"""
+    def __init__(self, workers=None, hash_size_mb=16,
+                 features=SearchFeatures()):
+        # Instance variables
+        self.workers = workers or os.cpu_count() or 1
+        self.hash_size_mb = hash_size_mb
+        self.features = features
+        self._engine = Engine(hash_size_mb, features)
+        self._pool = multiprocessing.Pool(self.workers, _start_worker,
+                                          (hash_size_mb, features))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes"""
+        self._pool.close()
+        self._pool.join()
+
+    def search(self, board, depth):
+        """Searches the board to the passed depth and returns the best move
+        with the score of every root move and each worker's result. Scores
+        of moves that didn't beat the first move are upper bounds. The board
+        is left as it was passed"""
+        start_time = time.perf_counter()
+        moves = MoveOrderer().order_moves(board, board.legal_moves())
+        if not moves:
+            score = -MATE_SCORE if board.is_king_attacked(board.turn_color) \
+                else 0
+            return ParallelSearchResult(None, score, depth, 0, 0.0, 0.0, [],
+                                        {}, [])
+
+        # The best move of a search one ply shallower goes first since it
+        # sets the bound the other moves have to beat
+        first_nodes = 0
+        if depth > 1:
+            self._engine.clear()
+            shallow_result = self._engine.search(
+                board, SearchLimits(depth=depth - 1))
+            first_nodes = self._engine.nodes
+            moves.remove(shallow_result.best_move)
+            moves.insert(0, shallow_result.best_move)
+        fen, history = return_position(board)
+        first_score, first_variation, move_nodes = _search_root_move(
+            self._engine, fen, history, moves[0], depth)
+        first_nodes += move_nodes
+        move_scores = {moves[0]: first_score}
+        principal_variations = {moves[0]: first_variation}
+
+        # Deal the other moves out in turn so the likely best ones are
+        # spread over the workers
+        other_moves = moves[1:]
+        tasks = [(worker, fen, history, other_moves[worker::self.workers],
+                  depth, first_score)
+                 for worker in range(min(self.workers, len(other_moves)))]
+        worker_results = []
+        for worker_result, worker_variations in \
+                self._pool.map(_search_root_moves, tasks):
+            worker_results.append(worker_result)
+            for move, score, principal_variation in zip(
+                    worker_result.moves, worker_result.scores,
+                    worker_variations):
+                move_scores[move] = score
+                principal_variations[move] = principal_variation
+
+        # Ties go to the move that came first in the ordering
+        best_move = max(moves, key=lambda move: (move_scores[move],
+                                                 -moves.index(move)))
+        nodes = first_nodes + sum(worker_result.nodes
+                                  for worker_result in worker_results)
+        seconds = time.perf_counter() - start_time
+        return ParallelSearchResult(best_move, move_scores[best_move], depth,
+                                    nodes, seconds,
+                                    nodes/seconds if seconds else 0.0,
+                                    principal_variations[best_move],
+                                    move_scores, worker_results)
+
+
+def main(arguments=None):
+    """Searches a position with several processes and prints the best move,
+    the speed of every worker and the speedup over a single process"""
+    parser = argparse.ArgumentParser(description='Search a chess position '
+                                     'for the best move on several cores')
+    parser.add_argument('--fen', default=STARTING_FEN,
+                        help='position to search')
+    parser.add_argument('--depth', type=int, default=4, help='search depth')
+    parser.add_argument('--workers', type=int,
+                        help='number of worker processes (default: one per '
+                        'core)')
+    parser.add_argument('--hash', type=int, default=16,
+                        help='transposition table size in MB per worker')
+    parser.add_argument('--no-serial', action='store_true',
+                        help="don't search with a single process as well to "
+                        "compare against")
+    arguments = parser.parse_args(arguments)
+    logging.basicConfig(
+        format='[%(asctime)s] %(levelname)s : %(funcName)s() - %(message)s',
+        level=logging.WARNING)
+
+    with ParallelSearch(arguments.workers, arguments.hash) as parallel_search:
+        result = parallel_search.search(Board(fen=arguments.fen),
+                                        arguments.depth)
+    for worker_result in result.worker_results:
+        print(f'worker {worker_result.worker:>2}  '
+              f'moves {len(worker_result.moves):>2}  '
+              f'nodes {worker_result.nodes:>9}  '
+              f'time {worker_result.seconds:8.3f}s  '
+              f'{worker_result.nodes_per_second:>8.0f} nodes/s')
+    if result.best_move is None:
+        print('no legal moves')
+        return 0
+    print(f'depth {result.depth}  score {score_to_text(result.score)}  '
+          f'nodes {result.nodes}  time {result.seconds:.3f}s  '
+          f'{result.nodes_per_second:.0f} nodes/s  pv '
+          f'{" ".join(map(move_to_text, result.principal_variation))}')
+    print(f'bestmove {move_to_text(result.best_move)}')
+    if not arguments.no_serial:
+        serial_result = Engine(arguments.hash).search(
+            Board(fen=arguments.fen), SearchLimits(depth=arguments.depth))
+        print(f'serial  score {score_to_text(serial_result.score)}  nodes '
+              f'{serial_result.nodes}  time {serial_result.seconds:.3f}s  '
+              f'bestmove {move_to_text(serial_result.best_move)}')
+        print(f'speedup {serial_result.seconds/result.seconds:.2f}x  '
+              f'node overhead {result.nodes/serial_result.nodes:.2f}x')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Pawn structure evaluation with a pawn hash table
+
+Created on Mon Oct 19 02:48:15 2026
+
+@author: danielb
+"""
+
+from array import array
+from collections import namedtuple
+from bitboards import FILE_A, NORTH, RAYS, SOUTH, square_indexes
+
+WHITE = 'White'
+BLACK = 'Black'
+PAWN = 'Pawn'
+
+FILES = tuple(FILE_A << column for column in range(8))
+ADJACENT_FILES = tuple((FILES[column - 1] if column > 0 else 0) |
+                       (FILES[column + 1] if column < 7 else 0)
+                       for column in range(8))
+
+
+def _passed_pawn_mask(square, direction):
+    """Returns the squares in front of a pawn on its own and the adjacent
+    files that must be free of enemy pawns for it to be passed"""
+    column = square & 7
+    mask = RAYS[direction][square]
+    if column > 0:
+        mask |= RAYS[direction][square - 1]
+    if column < 7:
+        mask |= RAYS[direction][square + 1]
+    return mask
+
+
+PASSED_PAWN_MASKS = {
+    WHITE: tuple(_passed_pawn_mask(square, NORTH) for square in range(64)),
+    BLACK: tuple(_passed_pawn_mask(square, SOUTH) for square in range(64))
+    }
+
+# Penalties and bonuses in centipawns (middlegame, endgame)
+DOUBLED_PAWN_PENALTY = (10, 20)
+ISOLATED_PAWN_PENALTY = (10, 15)
+# Passed pawn bonuses by how many rows the pawn has advanced
+PASSED_PAWN_BONUSES = ((0, 0), (5, 10), (10, 20), (15, 35), (25, 60),
+                       (40, 90), (60, 130), (0, 0))
+
+# The pawn structure scores (from white's side) and the passed pawns of
+# each color
+PawnEntry = namedtuple('PawnEntry', 'middlegame_score endgame_score '
+                       'white_passed_pawns black_passed_pawns')
+PawnHashStats = namedtuple('PawnHashStats', 'hits misses')
+
+# Keys, two scores and two passed pawn masks of 8 bytes each
+PAWN_ENTRY_BYTES = 40
+
+
+def _score_pawns(pawns, enemy_pawns, color):
+    """Returns the middlegame score, endgame score and passed pawns of one
+    color's pawns"""
+    middlegame_score = 0
+    endgame_score = 0
+    passed_pawns = 0
+    for column, file_mask in enumerate(FILES):
+        count = (pawns & file_mask).bit_count()
+        if not count:
+            continue
+        if count > 1:
+            middlegame_score -= DOUBLED_PAWN_PENALTY[0]*(count - 1)
+            endgame_score -= DOUBLED_PAWN_PENALTY[1]*(count - 1)
+        if not pawns & ADJACENT_FILES[column]:
+            middlegame_score -= ISOLATED_PAWN_PENALTY[0]*count
+            endgame_score -= ISOLATED_PAWN_PENALTY[1]*count
+    passed_pawn_masks = PASSED_PAWN_MASKS[color]
+    for square in square_indexes(pawns):
+        if enemy_pawns & passed_pawn_masks[square]:
+            continue
+        # A pawn behind another of its own color on the file isn't passed
+        if color == WHITE:
+            if pawns & RAYS[NORTH][square]:
+                continue
+            rows_advanced = (square >> 3) - 1
+        else:
+            if pawns & RAYS[SOUTH][square]:
+                continue
+            rows_advanced = 6 - (square >> 3)
+        passed_pawns |= 1 << square
+        middlegame_score += PASSED_PAWN_BONUSES[rows_advanced][0]
+        endgame_score += PASSED_PAWN_BONUSES[rows_advanced][1]
+    return middlegame_score, endgame_score, passed_pawns
+
+
+def evaluate_pawn_structure(white_pawns, black_pawns):
+    """Scores doubled, isolated and passed pawns from the pawn bitboards"""
+    white_middlegame, white_endgame, white_passed = _score_pawns(
+        white_pawns, black_pawns, WHITE)
+    black_middlegame, black_endgame, black_passed = _score_pawns(
+        black_pawns, white_pawns, BLACK)
+    return PawnEntry(white_middlegame - black_middlegame,
+                     white_endgame - black_endgame, white_passed,
+                     black_passed)
+
+
+class PawnHashTable():
+    """Class for a fixed size table that caches the pawn structure entry of
+    each pawn key. Pawns move far less often than other pieces so nearly
+    every lookup in a search is a hit"""
+    def __init__(self, size_kb=1024):
+        # Use the largest power of two number of entries that fits
+        entry_count = max(1, size_kb*1024//PAWN_ENTRY_BYTES)
+        self.entry_count = 1 << (entry_count.bit_length() - 1)
+        self._index_mask = self.entry_count - 1
+        self._keys = array('Q', bytes(8*self.entry_count))
+        self._middlegame_scores = array('q', bytes(8*self.entry_count))
+        self._endgame_scores = array('q', bytes(8*self.entry_count))
+        self._white_passed_pawns = array('Q', bytes(8*self.entry_count))
+        self._black_passed_pawns = array('Q', bytes(8*self.entry_count))
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def return_stats(self):
+        """Returns the hit and miss counters"""
+        return PawnHashStats(self.hits, self.misses)
+
+    def lookup(self, board):
+        """Returns the pawn structure entry for the board's pawns, working
+        it out and storing it if it isn't cached"""
+        key = board.pawn_key
+        index = key & self._index_mask
+        if self._keys[index] == key and key:
+            self.hits += 1
+            return PawnEntry(self._middlegame_scores[index],
+                             self._endgame_scores[index],
+                             self._white_passed_pawns[index],
+                             self._black_passed_pawns[index])
+        self.misses += 1
+        entry = evaluate_pawn_structure(board.piece_bitboards[WHITE][PAWN],
+                                        board.piece_bitboards[BLACK][PAWN])
+        self._keys[index] = key
+        self._middlegame_scores[index] = entry.middlegame_score
+        self._endgame_scores[index] = entry.endgame_score
+        self._white_passed_pawns[index] = entry.white_passed_pawns
+        self._black_passed_pawns[index] = entry.black_passed_pawns
+        return entry
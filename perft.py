@@ -0,0 +1,149 @@
+"""
+Move generator correctness and speed checks
+
+Created on Sun Oct 18 21:12:40 2026
+
+@author: danielb
+"""
+
+import argparse
+import logging
+import sys
+import time
+from collections import namedtuple
+from bitboards import BitboardMoveGenerator
+from board import Board, PieceMoveGenerator, STARTING_FEN
+from helpful_functions import move_to_text
+
+# Standard perft test positions with their known node counts by depth
+PerftPosition = namedtuple('PerftPosition', 'name fen node_counts')
+PERFT_POSITIONS = (
+    PerftPosition('start', STARTING_FEN,
+                  (20, 400, 8902, 197281, 4865609)),
+    PerftPosition('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/'
+                  'PPPBBPPP/R3K2R w KQkq - 0 1',
+                  (48, 2039, 97862, 4085603)),
+    PerftPosition('endgame', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                  (14, 191, 2812, 43238, 674624)),
+    PerftPosition('promotions', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/'
+                  'Pp1P2PP/R2Q1RK1 w kq - 0 1',
+                  (6, 264, 9467, 422333)),
+    PerftPosition('talkchess', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/'
+                  'RNBQK2R w KQ - 1 8',
+                  (44, 1486, 62379, 2103487)),
+    PerftPosition('middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/'
+                  'P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                  (46, 2079, 89890, 3894594))
+    )
+
+MOVE_GENERATORS = {
+    'pieces': PieceMoveGenerator,
+    'bitboard': BitboardMoveGenerator
+    }
+
+# Result of timing a perft run
+PerftResult = namedtuple('PerftResult', 'name depth nodes expected_nodes '
+                         'seconds nodes_per_second')
+
+
+def perft(board, depth):
+    """Returns the number of leaf positions reached by playing every legal
+    move down to the passed depth"""
+    if depth == 0:
+        return 1
+    moves = board.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """Returns a dictionary with the perft node count below each legal move
+    in long algebraic text, for tracking down move generation bugs"""
+    node_counts = {}
+    for move in board.legal_moves():
+        board.make_move(move)
+        node_counts[move_to_text(move)] = perft(board, depth - 1)
+        board.unmake_move()
+    return node_counts
+
+
+def run_perft(position, depth, move_generator='bitboard'):
+    """Times a perft run of one of the test positions and returns the
+    result with the expected node count (or None if it isn't known)"""
+    board = Board(MOVE_GENERATORS[move_generator](), position.fen)
+    start_time = time.perf_counter()
+    nodes = perft(board, depth)
+    seconds = time.perf_counter() - start_time
+    expected_nodes = None
+    if depth <= len(position.node_counts):
+        expected_nodes = position.node_counts[depth - 1]
+    return PerftResult(position.name, depth, nodes, expected_nodes, seconds,
+                       nodes/seconds if seconds else 0.0)
+
+
+def main(arguments=None):
+    """Runs the perft positions and reports node counts and speed. Returns
+    a non-zero exit code if any node count is wrong"""
+    parser = argparse.ArgumentParser(description='Chess move generator '
+                                     'perft and benchmark suite')
+    parser.add_argument('--depth', type=int, default=3,
+                        help='search depth for every position')
+    parser.add_argument('--position', action='append',
+                        choices=[position.name for position in
+                                 PERFT_POSITIONS],
+                        help='only run the named position (repeatable)')
+    parser.add_argument('--generator', choices=sorted(MOVE_GENERATORS),
+                        default='bitboard', help='move generator to use')
+    parser.add_argument('--divide', action='store_true',
+                        help='show the node count below each root move')
+    parser.add_argument('--fen', help='run a custom position instead')
+    arguments = parser.parse_args(arguments)
+    logging.basicConfig(
+        format='[%(asctime)s] %(levelname)s : %(funcName)s() - %(message)s',
+        level=logging.WARNING)
+
+    if arguments.fen:
+        positions = [PerftPosition('custom', arguments.fen, ())]
+    else:
+        positions = [position for position in PERFT_POSITIONS
+                     if not arguments.position or
+                     position.name in arguments.position]
+
+    failures = 0
+    total_nodes = 0
+    total_seconds = 0.0
+    for position in positions:
+        if arguments.divide:
+            board = Board(MOVE_GENERATORS[arguments.generator](),
+                          position.fen)
+            for move_text, nodes in sorted(divide(board,
+                                                  arguments.depth).items()):
+                print(f'{move_text}: {nodes}')
+        result = run_perft(position, arguments.depth, arguments.generator)
+        total_nodes += result.nodes
+        total_seconds += result.seconds
+        if result.expected_nodes is None:
+            status = 'unknown'
+        elif result.nodes == result.expected_nodes:
+            status = 'ok'
+        else:
+            status = f'FAILED (expected {result.expected_nodes})'
+            failures += 1
+        print(f'{result.name:<12} depth {result.depth}  '
+              f'nodes {result.nodes:>10}  time {result.seconds:8.3f}s  '
+              f'{result.nodes_per_second:>10.0f} nodes/s  {status}')
+
+    if total_seconds:
+        print(f'{"total":<12} {total_nodes} nodes in {total_seconds:.3f}s, '
+              f'{total_nodes/total_seconds:.0f} nodes/s')
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
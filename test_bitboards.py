@@ -0,0 +1,101 @@
+"""
+Created on Sun Oct 18 19:48:12 2026
+
+@author: danielb
+"""
+
+import random
+import unittest
+from bitboards import BitboardMoveGenerator, KING_SQUARES, KNIGHT_SQUARES, \
+    PAWN_ATTACK_SQUARES, bishop_attacks, rook_attacks, square_indexes
+from board import Board, PieceMoveGenerator
+from helpful_functions import square_to_index
+
+PROMOTION_FEN = 'n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1'
+
+
+def potential_moves(generator, board, piece):
+    """Returns the sorted potential moves found by the passed generator"""
+    generator.check_potential_moves(board, piece)
+    return (sorted(piece.possible_moves), sorted(piece.possible_captures),
+            sorted(piece.possible_special_moves))
+
+
+class BitboardMoveGeneratorTestCase(unittest.TestCase):
+    """Tests that the bitboard generator matches the pieces' own rules"""
+    def test_matches_piece_generator(self):
+        random_generator = random.Random(2019)
+        piece_generator = PieceMoveGenerator()
+        bitboard_generator = BitboardMoveGenerator()
+        board = Board()
+        for _ in range(80):
+            if board.winner is not None:
+                break
+            moves = []
+            for piece in list(board.pieces):
+                if piece.color != board.turn_color:
+                    continue
+                expected_output = potential_moves(piece_generator, board,
+                                                  piece)
+                output = potential_moves(bitboard_generator, board, piece)
+                self.assertEqual(output, expected_output)
+                for move_list in output:
+                    moves.extend((piece, move) for move in move_list)
+            piece, new_position = random_generator.choice(moves)
+            board.move_piece(piece, new_position, 'Queen')
+
+    def test_board_uses_selected_generator(self):
+        board = Board(BitboardMoveGenerator())
+        knight = board.return_piece(square_to_index('1g'))
+        board.check_potential_moves(knight)
+        self.assertEqual(sorted(knight.possible_moves),
+                         [square_to_index('3f'), square_to_index('3h')])
+
+    def test_legal_moves_match_piece_generator(self):
+        random_generator = random.Random(2020)
+        board = Board(BitboardMoveGenerator(), PROMOTION_FEN)
+        piece_board = Board(PieceMoveGenerator(), PROMOTION_FEN)
+        for _ in range(60):
+            moves = board.legal_moves()
+            self.assertEqual(sorted(moves), sorted(piece_board.legal_moves()))
+            self.assertEqual(sorted(board.generate_captures()),
+                             sorted(piece_board.generate_captures()))
+            if not moves:
+                break
+            move = random_generator.choice(moves)
+            board.make_move(move)
+            piece_board.make_move(move)
+
+
+class AttackTableTestCase(unittest.TestCase):
+    """Tests out the precomputed knight, king and pawn attack tables"""
+    def test_knight_squares(self):
+        self.assertEqual(sorted(KNIGHT_SQUARES[square_to_index('1a')]),
+                         [square_to_index('2c'), square_to_index('3b')])
+        self.assertEqual(len(KNIGHT_SQUARES[square_to_index('4d')]), 8)
+
+    def test_king_squares(self):
+        self.assertEqual(len(KING_SQUARES[square_to_index('1a')]), 3)
+        self.assertEqual(len(KING_SQUARES[square_to_index('4d')]), 8)
+
+    def test_pawn_attack_squares(self):
+        self.assertEqual(PAWN_ATTACK_SQUARES['White'][square_to_index('2a')],
+                         (square_to_index('3b'),))
+        self.assertEqual(PAWN_ATTACK_SQUARES['Black'][square_to_index('7h')],
+                         (square_to_index('6g'),))
+
+    def test_rook_rays_stop_at_blockers(self):
+        occupied = (1 << square_to_index('1d')) | (1 << square_to_index('4a'))
+        attacks = rook_attacks(square_to_index('1a'), occupied)
+        expected_output = sorted(square_to_index(name) for name in
+                                 ('1b', '1c', '1d', '2a', '3a', '4a'))
+        self.assertEqual(square_indexes(attacks), expected_output)
+
+    def test_bishop_rays_stop_at_blockers(self):
+        occupied = 1 << square_to_index('6f')
+        attacks = bishop_attacks(square_to_index('4d'), occupied)
+        self.assertEqual(len(square_indexes(attacks)), 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,312 @@
+"""
+Created on Sun Oct 18 18:40:27 2026
+
+@author: danielb
+"""
+
+import random
+import unittest
+from board import Board, Move
+from helpful_functions import square_to_index
+from helpful_test_functions import KIWIPETE_FEN, play_moves
+
+
+def count_moves(board):
+    """Returns the number of moves available to the side to move"""
+    count = 0
+    for piece in list(board.pieces):
+        if piece.color == board.turn_color:
+            board.check_potential_moves(piece)
+            count += len(piece.possible_moves) + \
+                len(piece.possible_captures) + \
+                len(piece.possible_special_moves)
+    return count
+
+
+class BoardTestCase(unittest.TestCase):
+    """Tests out the headless board without any display"""
+    def test_starting_move_count(self):
+        board = Board()
+        self.assertEqual(count_moves(board), 20)
+
+    def test_pawn_jump_sets_en_passant_square(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'),))
+        self.assertEqual(board.en_passant_square, square_to_index('3e'))
+        self.assertEqual(board.turn_color, 'Black')
+
+    def test_en_passant_capture(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'), ('7a', '6a'),
+                           ('4e', '5e'), ('7d', '5d')))
+        pawn = board.return_piece(square_to_index('5e'))
+        board.check_potential_moves(pawn)
+        self.assertEqual(pawn.possible_special_moves, [square_to_index('6d')])
+        play_moves(board, (('5e', '6d'),))
+        self.assertIsNone(board.return_piece(square_to_index('5d')))
+        self.assertEqual(len(board.pieces), 31)
+
+    def test_castle_moves_rook(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'), ('7e', '5e'), ('1g', '3f'),
+                           ('8g', '6f'), ('1f', '4c'), ('8f', '5c'),
+                           ('1e', '1g')))
+        rook = board.return_piece(square_to_index('1f'))
+        self.assertEqual(rook.piece_type, 'Rook')
+        self.assertIsNone(board.return_piece(square_to_index('1h')))
+
+    def test_square_map_follows_moves(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'), ('7d', '5d'), ('4e', '5d'),
+                           ('8d', '5d'), ('1g', '3f'), ('7e', '5e'),
+                           ('1f', '4c'), ('5d', '4c')))
+        expected_squares = [None]*64
+        expected_occupancy = {'White': 0, 'Black': 0}
+        for piece in board.pieces:
+            expected_squares[piece.position] = piece
+            expected_occupancy[piece.color] |= 1 << piece.position
+        self.assertEqual(board.return_squares(), expected_squares)
+        self.assertEqual(board.return_occupancy(), expected_occupancy)
+
+    def test_piece_lookups(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'), ('7e', '5e'), ('1e', '2e')))
+        self.assertEqual(board.return_king_position('White'),
+                         square_to_index('2e'))
+        self.assertEqual(board.return_piece(square_to_index('2e')).piece_type,
+                         'King')
+        self.assertEqual(len(board.return_pieces('Black', 'Pawn')), 8)
+        self.assertEqual(board.return_piece_bitboard('White', 'King'),
+                         1 << square_to_index('2e'))
+
+    def test_generate_captures(self):
+        board = Board(fen='4k3/2P5/8/3pP3/8/8/8/2R1K3 w - d6 0 1')
+        self.assertEqual(sorted(board.generate_captures()),
+                         sorted([Move(square_to_index('5e'),
+                                      square_to_index('6d')),
+                                 Move(square_to_index('7c'),
+                                      square_to_index('8c'), 'Queen')]))
+
+    def test_attackers_to(self):
+        board = Board(fen='3rk3/8/8/3p4/2P5/8/3Q4/3RK3 w - - 0 1')
+        square = square_to_index('5d')
+        occupied = board.occupancy['White'] | board.occupancy['Black']
+        self.assertEqual(board.attackers_to(square, occupied),
+                         (1 << square_to_index('4c')) |
+                         (1 << square_to_index('2d')) |
+                         (1 << square_to_index('8d')))
+
+    def test_checks_and_pins(self):
+        # The e2 knight is pinned by the e8 rook and the b4 bishop checks
+        board = Board(fen='4r1k1/8/8/8/1b6/8/4N3/4K3 w - - 0 1')
+        checkers, check_mask, pins = board.return_checks_and_pins('White')
+        self.assertEqual(checkers, 1 << square_to_index('4b'))
+        self.assertEqual(check_mask, (1 << square_to_index('4b')) |
+                         (1 << square_to_index('3c')) |
+                         (1 << square_to_index('2d')))
+        self.assertEqual(list(pins), [square_to_index('2e')])
+        # The pinned knight can't block so only the king can move
+        self.assertEqual({move.start for move in board.legal_moves()},
+                         {square_to_index('1e')})
+
+    def test_double_check_only_king_moves(self):
+        board = Board(fen='4k3/8/8/8/8/5n2/3Q4/r3K3 w - - 0 1')
+        self.assertEqual({move.start for move in board.legal_moves()},
+                         {square_to_index('1e')})
+
+    def test_en_passant_uncovering_check(self):
+        board = Board(fen='8/8/8/KPp4r/8/8/8/4k3 w - c6 0 1')
+        self.assertNotIn(Move(square_to_index('5b'), square_to_index('6c')),
+                         board.legal_moves())
+
+    def test_king_cannot_step_along_check(self):
+        board = Board(fen='4k3/8/8/8/8/8/8/r3K3 w - - 0 1')
+        self.assertNotIn(Move(square_to_index('1e'), square_to_index('1f')),
+                         board.legal_moves())
+
+    def test_checkmate(self):
+        board = Board()
+        play_moves(board, (('2f', '3f'), ('7e', '5e'), ('2g', '4g'),
+                           ('8d', '4h')))
+        self.assertEqual(board.result, 'Checkmate')
+        self.assertEqual(board.winner, 'Black')
+        self.assertEqual(board.legal_moves(), [])
+
+    def test_stalemate(self):
+        board = Board(fen='7k/8/5Q2/6K1/8/8/8/8 w - - 0 1')
+        play_moves(board, (('6f', '6g'),))
+        self.assertEqual(board.result, 'Stalemate')
+        self.assertIsNone(board.winner)
+
+    def test_legal_move_cache(self):
+        board = Board()
+        legal_moves = board.return_legal_moves()
+        self.assertIs(board.return_legal_moves(), legal_moves)
+        self.assertEqual(list(legal_moves), board.legal_moves())
+        play_moves(board, (('2e', '4e'),))
+        self.assertIsNot(board.return_legal_moves(), legal_moves)
+        self.assertEqual(list(board.return_legal_moves()),
+                         board.legal_moves())
+        board.unmake_move()
+        self.assertEqual(board.return_legal_moves(), legal_moves)
+
+    def test_threefold_repetition(self):
+        board = Board()
+        knight_moves = (('1g', '3f'), ('8g', '6f'), ('3f', '1g'),
+                        ('6f', '8g'))
+        play_moves(board, knight_moves)
+        self.assertTrue(board.is_repetition(2))
+        self.assertFalse(board.is_repetition(3))
+        self.assertIsNone(board.result)
+        play_moves(board, knight_moves)
+        self.assertTrue(board.is_repetition(3))
+        self.assertEqual(board.result, 'Threefold repetition')
+        self.assertIsNone(board.winner)
+
+    def test_no_repetition_across_pawn_move(self):
+        board = Board(fen='4k3/8/8/8/8/8/4P3/4K3 w - - 0 1')
+        play_moves(board, (('1e', '1d'), ('8e', '8d'), ('1d', '1e'),
+                           ('8d', '8e'), ('2e', '3e')))
+        self.assertFalse(board.is_repetition(2))
+        self.assertEqual(board.halfmove_clock, 0)
+
+    def test_fifty_move_rule(self):
+        board = Board(fen='4k3/8/8/8/8/8/8/R3K3 w - - 99 80')
+        self.assertFalse(board.is_fifty_move_draw())
+        play_moves(board, (('1a', '2a'),))
+        self.assertTrue(board.is_fifty_move_draw())
+        self.assertEqual(board.result, 'Fifty-move rule')
+        self.assertEqual(board.return_fen(),
+                         '4k3/8/8/8/8/8/R7/4K3 b - - 100 80')
+
+    def test_clocks_restored_by_unmake(self):
+        board = Board(fen='4k3/8/8/8/8/8/4P3/4K3 b - - 7 30')
+        fen = board.return_fen()
+        board.make_move(Move(square_to_index('8e'), square_to_index('8d')))
+        board.make_move(Move(square_to_index('2e'), square_to_index('4e')))
+        self.assertEqual(board.return_fen().split()[4:], ['0', '31'])
+        board.unmake_move()
+        board.unmake_move()
+        self.assertEqual(board.return_fen(), fen)
+        self.assertEqual(board.key_history, [board.zobrist_key])
+
+
+def board_state(board):
+    """Returns everything about the board that make and unmake change"""
+    squares = [(piece.color, piece.piece_type, piece.has_been_moved)
+               if piece else None for piece in board.squares]
+    return (squares, dict(board.occupancy), board.castling_rights,
+            board.en_passant_square, board.turn_color)
+
+
+class MakeUnmakeTestCase(unittest.TestCase):
+    """Tests that unmaking moves puts the board back the way it was"""
+    def test_unmake_restores_board(self):
+        random_generator = random.Random(2020)
+        for _ in range(20):
+            board = Board()
+            states = []
+            for _ in range(40):
+                moves = board.generate_moves()
+                if not board.return_pieces(board.turn_color, 'King'):
+                    break
+                states.append(board_state(board))
+                board.make_move(random_generator.choice(moves))
+            while states:
+                board.unmake_move()
+                self.assertEqual(board_state(board), states.pop())
+
+    def test_unmake_promotion(self):
+        board = Board()
+        pawn = board.return_piece(square_to_index('2a'))
+        for name in ('7a', '8b', '8a'):
+            board._remove_piece(board.return_piece(square_to_index(name)))
+        board._relocate_piece(pawn, square_to_index('7a'))
+        state = board_state(board)
+        board.make_move(Move(square_to_index('7a'), square_to_index('8b'),
+                             'Knight'))
+        self.assertEqual(board.return_piece(square_to_index('8b')).piece_type,
+                         'Knight')
+        board.unmake_move()
+        self.assertEqual(board_state(board), state)
+        self.assertIs(board.return_piece(square_to_index('7a')), pawn)
+
+    def test_promoted_pieces_are_reused(self):
+        board = Board()
+        pawn = board.return_piece(square_to_index('2a'))
+        for name in ('7a', '8b', '8a'):
+            board._remove_piece(board.return_piece(square_to_index(name)))
+        board._relocate_piece(pawn, square_to_index('7a'))
+        state = board_state(board)
+        board.make_move(Move(square_to_index('7a'), square_to_index('8a'),
+                             'Queen'))
+        queen = board.return_piece(square_to_index('8a'))
+        board.unmake_move()
+        board.make_move(Move(square_to_index('7a'), square_to_index('8b'),
+                             'Queen'))
+        self.assertIs(board.return_piece(square_to_index('8b')), queen)
+        self.assertEqual(queen.position, square_to_index('8b'))
+        self.assertEqual(board.zobrist_key, board.compute_zobrist_key())
+        board.unmake_move()
+        self.assertEqual(board_state(board), state)
+
+    def test_null_move(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'),))
+        state = board_state(board)
+        zobrist_key = board.zobrist_key
+        board.make_null_move()
+        self.assertEqual(board.turn_color, 'White')
+        self.assertIsNone(board.en_passant_square)
+        self.assertEqual(board.zobrist_key, board.compute_zobrist_key())
+        self.assertIsNone(board.unmake_move())
+        self.assertEqual(board_state(board), state)
+        self.assertEqual(board.zobrist_key, zobrist_key)
+
+
+class ZobristTestCase(unittest.TestCase):
+    """Tests that the Zobrist key is kept up to date as moves are made"""
+    def test_incremental_key_matches_full_key(self):
+        random_generator = random.Random(2021)
+        board = Board(fen=KIWIPETE_FEN)
+        for _ in range(60):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(random_generator.choice(moves))
+            self.assertEqual(board.zobrist_key, board.compute_zobrist_key())
+        while board.move_history:
+            board.unmake_move()
+            self.assertEqual(board.zobrist_key, board.compute_zobrist_key())
+
+    def test_same_position_same_key(self):
+        board = Board()
+        starting_key = board.zobrist_key
+        play_moves(board, (('1g', '3f'), ('8g', '6f'),
+                           ('3f', '1g'), ('6f', '8g')))
+        self.assertEqual(board.zobrist_key, starting_key)
+        play_moves(board, (('2e', '3e'),))
+        self.assertNotEqual(board.zobrist_key, starting_key)
+
+    def test_en_passant_only_hashed_when_capturable(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'),))
+        self.assertEqual(board.zobrist_key, Board(
+            fen='rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1'
+            ).zobrist_key)
+        # Going out and back with the knights repeats the position
+        play_moves(board, (('8g', '6f'), ('1g', '3f'),
+                           ('6f', '8g'), ('3f', '1g')))
+        self.assertTrue(board.is_repetition(2))
+
+        board = Board(fen='rnbqkbnr/ppp1pppp/8/8/3p4/8/PPPPPPPP/RNBQKBNR '
+                      'w KQkq - 0 1')
+        play_moves(board, (('2e', '4e'),))
+        self.assertNotEqual(board.zobrist_key, Board(
+            fen='rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1'
+            ).zobrist_key)
+        self.assertEqual(board.zobrist_key, board.compute_zobrist_key())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Created on Sun Oct 18 23:31:18 2026
+
+@author: danielb
+"""
+
+import threading
+import time
+import unittest
+from board import Board, Move
+from engine import MATE_SCORE, Engine, SearchFeatures, SearchLimits
+from helpful_functions import algebraic_to_index
+from helpful_test_functions import MATE_IN_ONE_FEN
+
+
+class EngineTestCase(unittest.TestCase):
+    """Tests the alpha-beta search and its limits"""
+    def setUp(self):
+        self.engine = Engine(1)
+
+    def test_finds_mate_in_one(self):
+        result = self.engine.search(Board(fen=MATE_IN_ONE_FEN),
+                                    SearchLimits(depth=3))
+        self.assertEqual(result.best_move, Move(algebraic_to_index('a1'),
+                                                algebraic_to_index('a8')))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+
+    def test_takes_hanging_queen(self):
+        board = Board(fen='4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1')
+        result = self.engine.search(board, SearchLimits(depth=2))
+        self.assertEqual(result.best_move, Move(algebraic_to_index('d1'),
+                                                algebraic_to_index('d5')))
+        self.assertEqual(result.principal_variation[0], result.best_move)
+
+    def test_quiescence_sees_recapture(self):
+        board = Board(fen='4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1')
+        result = self.engine.search(board, SearchLimits(depth=1))
+        self.assertNotEqual(result.best_move,
+                            Move(algebraic_to_index('d1'),
+                                 algebraic_to_index('d5')))
+        self.assertGreater(self.engine.quiescence_nodes, 0)
+
+    def test_depth_limit(self):
+        depths = []
+        result = self.engine.search(Board(), SearchLimits(depth=3),
+                                    lambda info: depths.append(info.depth))
+        self.assertEqual(depths, [1, 2, 3])
+        self.assertEqual(result.depth, 3)
+        self.assertGreater(result.nodes_per_second, 0)
+
+    def test_node_limit_leaves_board_unchanged(self):
+        board = Board()
+        fen = board.return_fen()
+        result = self.engine.search(board, SearchLimits(nodes=500))
+        self.assertLessEqual(result.nodes, 500)
+        self.assertIsNotNone(result.best_move)
+        self.assertEqual(board.return_fen(), fen)
+        self.assertEqual(board.move_history, [])
+
+    def test_time_limit(self):
+        start_time = time.perf_counter()
+        result = self.engine.search(Board(), SearchLimits(time=0.3))
+        self.assertLess(time.perf_counter() - start_time, 0.6)
+        self.assertIsNotNone(result.best_move)
+
+    def test_depth_zero_searches_one_ply(self):
+        result = self.engine.search(Board(), SearchLimits(depth=0))
+        self.assertEqual(result.depth, 1)
+        self.assertIsNotNone(result.best_move)
+
+    def test_stop_from_another_thread(self):
+        timer = threading.Timer(0.2, self.engine.stop)
+        timer.start()
+        start_time = time.perf_counter()
+        result = self.engine.search(Board())
+        timer.join()
+        self.assertLess(time.perf_counter() - start_time, 1.0)
+        self.assertIsNotNone(result.best_move)
+
+    def test_stop_event_set_before_search(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        result = self.engine.search(Board(), stop_event=stop_event)
+        self.assertEqual(result.depth, 0)
+        self.assertIsNotNone(result.best_move)
+
+    def test_features_can_be_switched_off(self):
+        board = Board(fen=MATE_IN_ONE_FEN)
+        engine = Engine(1, SearchFeatures(False, False, False, False))
+        result = engine.search(board, SearchLimits(depth=3))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+        stats = engine.return_stats()
+        self.assertEqual((stats.null_move_cutoffs, stats.razored_nodes,
+                          stats.futility_pruned_moves, stats.reduced_moves),
+                         (0, 0, 0, 0))
+
+    def test_pruning_searches_fewer_nodes(self):
+        fen = 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq ' \
+            '- 2 3'
+        full_width = Engine(1, SearchFeatures(False, False, False, False))
+        full_width.search(Board(fen=fen), SearchLimits(depth=4))
+        self.engine.search(Board(fen=fen), SearchLimits(depth=4))
+        self.assertLess(self.engine.nodes, full_width.nodes)
+
+    def test_no_null_move_without_pieces(self):
+        # Passing would be the best move for white here
+        board = Board(fen='8/8/8/8/8/2k5/2p5/2K5 w - - 0 1')
+        self.assertIsNone(self.engine._null_move_search(board, 4, -500, 0))
+        self.assertEqual(board.move_history, [])
+
+    def test_no_legal_moves(self):
+        board = Board(fen='7k/5Q2/6K1/8/8/8/8/8 b - - 0 1')
+        result = self.engine.search(board, SearchLimits(depth=2))
+        self.assertIsNone(result.best_move)
+        self.assertEqual(result.score, 0)
+
+    def test_repetition_scored_as_draw(self):
+        # Black is a queen down but the knights have come back home
+        board = Board(fen='rnb1kbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w '
+                      'KQkq - 0 1')
+        for start, end in (('g1', 'f3'), ('g8', 'f6'), ('f3', 'g1'),
+                           ('f6', 'g8')):
+            board.make_move(Move(algebraic_to_index(start),
+                                 algebraic_to_index(end)))
+        self.assertEqual(self.engine._negamax(board, 2, -1, 1, 1), 0)
+        self.assertGreater(self.engine._negamax(board, 2, -1000, 1000, 0),
+                           500)
+
+    def test_fifty_move_rule_scored_as_draw(self):
+        # Any rook move ends the game in a draw
+        board = Board(fen='4k3/8/8/8/8/8/8/R3K3 w - - 99 80')
+        engine = Engine(1)
+        result = engine.search(board, SearchLimits(depth=2))
+        self.assertEqual(result.score, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Created on Mon Oct 19 04:40:52 2026
+
+@author: danielb
+"""
+
+import time
+import unittest
+from board import Board, Move
+from engine import SearchLimits
+from engine_worker import INFO, EngineWorker
+from helpful_functions import algebraic_to_index
+from helpful_test_functions import MATE_IN_ONE_FEN, wait_for_best_move
+
+
+class EngineWorkerTestCase(unittest.TestCase):
+    """Tests running searches on the background thread"""
+    def setUp(self):
+        self.worker = EngineWorker(1)
+
+    def tearDown(self):
+        self.worker.cancel()
+
+    def test_start_returns_straight_away(self):
+        board = Board()
+        start_time = time.perf_counter()
+        self.worker.start(board)
+        self.assertLess(time.perf_counter() - start_time, 0.1)
+        self.assertTrue(self.worker.is_searching())
+        self.worker.stop()
+        messages = wait_for_best_move(self.worker)
+        self.assertIsNotNone(messages[-1].result.best_move)
+
+    def test_stop_before_search_starts(self):
+        # An infinite search only finishes if the stop isn't lost
+        self.worker.start(Board())
+        self.worker.stop()
+        messages = wait_for_best_move(self.worker)
+        self.assertIsNotNone(messages[-1].result.best_move)
+
+    def test_streams_iterations_then_best_move(self):
+        board = Board(fen=MATE_IN_ONE_FEN)
+        search_id = self.worker.start(board, SearchLimits(depth=3))
+        messages = wait_for_best_move(self.worker)
+        self.assertEqual({message.search_id for message in messages},
+                         {search_id})
+        self.assertEqual(messages[0].kind, INFO)
+        self.assertEqual(messages[-1].result.best_move,
+                         Move(algebraic_to_index('a1'),
+                              algebraic_to_index('a8')))
+        # The board passed in isn't touched by the search
+        self.assertEqual(board.return_fen(), MATE_IN_ONE_FEN)
+
+    def test_cancel_drops_messages(self):
+        self.worker.start(Board())
+        time.sleep(0.2)
+        self.worker.cancel()
+        self.assertFalse(self.worker.is_searching())
+        self.assertEqual(self.worker.poll(), [])
+
+    def test_new_search_replaces_running_one(self):
+        self.worker.start(Board())
+        search_id = self.worker.start(Board(fen=MATE_IN_ONE_FEN),
+                                      SearchLimits(depth=2))
+        messages = wait_for_best_move(self.worker)
+        self.assertTrue(all(message.search_id == search_id
+                            for message in messages))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Created on Mon Oct 19 00:41:13 2026
+
+@author: danielb
+"""
+
+import random
+import unittest
+from board import Board, Move
+from evaluation import compute_scores, evaluate, static_exchange
+from helpful_functions import text_to_squares
+
+
+def exchange(fen, text):
+    """Returns the static exchange evaluation of a move in the position"""
+    return static_exchange(Board(fen=fen), Move(*text_to_squares(text)))
+
+
+class EvaluationTestCase(unittest.TestCase):
+    """Tests the static evaluation and static exchange evaluation"""
+    def test_starting_position_is_even(self):
+        self.assertEqual(evaluate(Board()), 0)
+
+    def test_score_is_for_side_to_move(self):
+        score = evaluate(Board(fen='4k3/8/8/8/8/8/8/3QK3 w - - 0 1'))
+        self.assertGreater(score, 800)
+        self.assertEqual(evaluate(Board(fen='4k3/8/8/8/8/8/8/3QK3 b - - 0 1')),
+                         -score)
+
+    def test_mirrored_position_scores_the_same(self):
+        white_score = evaluate(Board(fen='r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/'
+                                     '5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'))
+        black_score = evaluate(Board(fen='rnbqk2r/pppp1ppp/5n2/2b1p3/4P3/'
+                                     '2N2N2/PPPP1PPP/R1BQKB1R b KQkq - 4 4'))
+        self.assertEqual(white_score, black_score)
+
+    def test_piece_square_tables(self):
+        centre = evaluate(Board(fen='4k3/8/8/8/3N4/8/8/4K3 w - - 0 1'))
+        corner = evaluate(Board(fen='4k3/8/8/8/8/8/8/N3K3 w - - 0 1'))
+        self.assertGreater(centre, corner)
+
+    def test_endgame_king_wants_the_centre(self):
+        centre = evaluate(Board(fen='4k3/8/8/8/3K4/8/8/8 w - - 0 1'))
+        corner = evaluate(Board(fen='4k3/8/8/8/8/8/8/K7 w - - 0 1'))
+        self.assertGreater(centre, corner)
+
+    def test_incremental_scores_match_full_scores(self):
+        random_generator = random.Random(2022)
+        board = Board(fen='r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/'
+                      'R2Q1RK1 w kq - 0 1')
+        start_scores = compute_scores(board)
+        for _ in range(60):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(random_generator.choice(moves))
+            self.assertEqual((board.middlegame_score, board.endgame_score,
+                              board.phase), compute_scores(board))
+        while board.move_history:
+            board.unmake_move()
+        self.assertEqual((board.middlegame_score, board.endgame_score,
+                          board.phase), start_scores)
+
+    def test_undefended_capture(self):
+        self.assertEqual(exchange('1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w '
+                                  '- - 0 1', 'e1e5'), 100)
+
+    def test_losing_capture(self):
+        self.assertEqual(exchange('4k3/8/2p5/3p4/4Q3/8/8/4K3 w - - 0 1',
+                                  'e4d5'), -800)
+
+    def test_x_ray_recapture(self):
+        self.assertEqual(exchange('3rk3/8/8/3p4/8/8/3Q4/3RK3 w - - 0 1',
+                                  'd2d5'), -300)
+
+    def test_en_passant(self):
+        self.assertEqual(exchange('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1',
+                                  'e5d6'), 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,8 @@ Created on Sat Feb 23 19:14:43 2019
 """
 
 import unittest
-from helpful_functions import index_to_letter, letter_to_index
+from helpful_functions import index_to_letter, letter_to_index, \
+    index_to_square, square_to_index
 
 class HelpfulFunctionsTestCase(unittest.TestCase):
     """Tests functionality of index to letter and letter to index functions"""
@@ -31,5 +32,25 @@ class HelpfulFunctionsTestCase(unittest.TestCase):
             response = letter_to_index(letter)
             output.append(response)
         self.assertEqual(output, expected_output)
+
+    def test_square_to_index(self):
+        """Does the square_to_index function work properly"""
+        output = []
+        input_variables = ["1a", "1h", "2a", "4e", "8a", "8h"]
+        expected_output = [0, 7, 8, 28, 56, 63]
+        for square_name in input_variables:
+            response = square_to_index(square_name)
+            output.append(response)
+        self.assertEqual(output, expected_output)
+
+    def test_index_to_square(self):
+        """Does the index_to_square function work properly"""
+        output = []
+        input_variables = [0, 7, 8, 28, 56, 63]
+        expected_output = ["1a", "1h", "2a", "4e", "8a", "8h"]
+        for index in input_variables:
+            response = index_to_square(index)
+            output.append(response)
+        self.assertEqual(output, expected_output)
     
 unittest.main()
\ No newline at end of file
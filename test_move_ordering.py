@@ -0,0 +1,64 @@
+"""
+Created on Mon Oct 19 00:05:36 2026
+
+@author: danielb
+"""
+
+import unittest
+from board import Board, Move
+from helpful_functions import text_to_squares
+from move_ordering import MoveOrderer, is_quiet
+
+# White's pawn can take the queen or the rook and the queen can take the
+# rook
+CAPTURES_FEN = '4k3/8/8/2r1q3/3P1N2/8/4P3/2Q1K3 w - - 0 1'
+
+
+def text_to_move(text):
+    """Changes long algebraic move text into a move"""
+    return Move(*text_to_squares(text))
+
+
+class MoveOrdererTestCase(unittest.TestCase):
+    """Tests the order moves are searched in"""
+    def setUp(self):
+        self.orderer = MoveOrderer()
+        self.board = Board(fen=CAPTURES_FEN)
+        self.moves = self.board.legal_moves()
+
+    def test_hash_move_first(self):
+        hash_move = text_to_move('e1f1')
+        ordered = self.orderer.order_moves(self.board, self.moves, hash_move)
+        self.assertEqual(ordered[0], hash_move)
+        self.assertEqual(sorted(ordered), sorted(self.moves))
+
+    def test_most_valuable_victim_least_valuable_attacker(self):
+        ordered = self.orderer.order_moves(self.board, self.moves)
+        self.assertEqual(ordered[:3], [text_to_move('d4e5'),
+                                       text_to_move('d4c5'),
+                                       text_to_move('c1c5')])
+
+    def test_killers_before_history(self):
+        killer = text_to_move('e1d2')
+        history_move = text_to_move('e1f2')
+        self.orderer.record_cutoff(self.board, history_move, 6, 3, 4)
+        self.orderer.record_cutoff(self.board, killer, 1, 1, 0)
+        ordered = self.orderer.order_moves(self.board, self.moves, ply=1)
+        self.assertEqual(ordered[3:5], [killer, history_move])
+        self.assertEqual(self.orderer.return_stats(), (2, 1))
+        self.assertEqual(self.orderer.first_move_cutoff_rate(), 0.5)
+
+    def test_captures_are_not_killers(self):
+        capture = text_to_move('d4e5')
+        self.assertFalse(is_quiet(self.board, capture))
+        self.orderer.record_cutoff(self.board, capture, 3, 0, 0)
+        self.assertEqual(self.orderer.killers[0], [None, None])
+
+    def test_en_passant_is_not_quiet(self):
+        board = Board(fen='4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1')
+        self.assertFalse(is_quiet(board, text_to_move('e5d6')))
+        self.assertTrue(is_quiet(board, text_to_move('e5e6')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Created on Mon Oct 19 02:04:50 2026
+
+@author: danielb
+"""
+
+import unittest
+from board import Board, Move
+from engine import MATE_SCORE, Engine, SearchLimits
+from helpful_functions import algebraic_to_index
+from helpful_test_functions import KIWIPETE_FEN, play_moves
+from parallel_search import ParallelSearch, rebuild_board, return_position
+
+ITALIAN_FEN = 'r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq ' \
+    '- 3 3'
+NO_WHITE_QUEEN_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNB1KBNR w KQkq ' \
+    '- 0 1'
+
+
+class ParallelSearchTestCase(unittest.TestCase):
+    """Tests splitting the root moves between worker processes"""
+    def test_return_position_rebuilds_board(self):
+        board = Board()
+        play_moves(board, (('2e', '4e'), ('7c', '5c'), ('1g', '3f')))
+        fen, moves = return_position(board)
+        self.assertEqual(len(moves), 3)
+        self.assertEqual(rebuild_board(fen, moves).return_fen(),
+                         board.return_fen())
+        self.assertEqual(len(board.move_history), 3)
+
+    def test_same_result_for_any_number_of_workers(self):
+        results = []
+        for workers in (1, 3):
+            with ParallelSearch(workers, 1) as parallel_search:
+                results.append(parallel_search.search(
+                    Board(fen=KIWIPETE_FEN), 2))
+        self.assertEqual(results[0].move_scores, results[1].move_scores)
+        self.assertEqual(results[0].best_move, results[1].best_move)
+        self.assertEqual(results[0].nodes, results[1].nodes)
+        self.assertEqual(len(results[1].worker_results), 3)
+        self.assertEqual(len(results[0].move_scores), 48)
+
+    def test_finds_mate_in_one(self):
+        with ParallelSearch(2, 1) as parallel_search:
+            result = parallel_search.search(
+                Board(fen='6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1'), 1)
+        self.assertEqual(result.best_move, Move(algebraic_to_index('a1'),
+                                                algebraic_to_index('a8')))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+        for worker_result in result.worker_results:
+            self.assertGreaterEqual(worker_result.nodes_per_second, 0)
+
+    def test_repetition_matches_serial_search(self):
+        # White is a queen down and can repeat the position with 3f-1g
+        board = Board(fen=NO_WHITE_QUEEN_FEN)
+        play_moves(board, (('1g', '3f'), ('8g', '6f'), ('3f', '1g'),
+                           ('6f', '8g'), ('1g', '3f'), ('8g', '6f')))
+        serial_result = Engine(1).search(board, SearchLimits(depth=3))
+        with ParallelSearch(2, 1) as parallel_search:
+            result = parallel_search.search(board, 3)
+        repeating_move = Move(algebraic_to_index('f3'),
+                              algebraic_to_index('g1'))
+        self.assertEqual(result.move_scores[repeating_move], 0)
+        self.assertEqual(result.best_move, serial_result.best_move)
+        self.assertEqual(result.score, serial_result.score)
+        self.assertEqual(result.best_move, repeating_move)
+        self.assertEqual(result.score, 0)
+
+    def test_work_close_to_serial_search(self):
+        # Only the first move is searched with a full window, so the extra
+        # work over one process stays small
+        serial_result = Engine(1).search(Board(fen=ITALIAN_FEN),
+                                         SearchLimits(depth=4))
+        with ParallelSearch(2, 1) as parallel_search:
+            result = parallel_search.search(Board(fen=ITALIAN_FEN), 4)
+        self.assertEqual(result.score, serial_result.score)
+        self.assertLess(result.nodes, 3*serial_result.nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
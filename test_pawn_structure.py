@@ -0,0 +1,76 @@
+"""
+Created on Mon Oct 19 03:12:40 2026
+
+@author: danielb
+"""
+
+import random
+import unittest
+from board import Board
+from helpful_functions import algebraic_to_index
+from pawn_structure import DOUBLED_PAWN_PENALTY, ISOLATED_PAWN_PENALTY, \
+    PASSED_PAWN_BONUSES, PawnHashTable, evaluate_pawn_structure
+
+
+def pawn_entry(fen):
+    """Returns the pawn structure entry of the position"""
+    board = Board(fen=fen)
+    return evaluate_pawn_structure(board.piece_bitboards['White']['Pawn'],
+                                   board.piece_bitboards['Black']['Pawn'])
+
+
+class PawnStructureTestCase(unittest.TestCase):
+    """Tests the pawn structure terms and the pawn hash table"""
+    def test_starting_position_is_even(self):
+        self.assertEqual(pawn_entry('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/'
+                                    'RNBQKBNR w KQkq - 0 1'), (0, 0, 0, 0))
+
+    def test_doubled_and_isolated_pawns(self):
+        # White's a pawns are doubled and isolated with the front one
+        # passed. The g and h pawns are isolated and block each other
+        entry = pawn_entry('4k3/7p/8/8/8/P7/P5P1/4K3 w - - 0 1')
+        self.assertEqual(entry.middlegame_score,
+                         -DOUBLED_PAWN_PENALTY[0] -
+                         2*ISOLATED_PAWN_PENALTY[0] +
+                         PASSED_PAWN_BONUSES[1][0] -
+                         ISOLATED_PAWN_PENALTY[0] +
+                         ISOLATED_PAWN_PENALTY[0])
+        self.assertEqual(entry.white_passed_pawns,
+                         1 << algebraic_to_index('a3'))
+        self.assertEqual(entry.black_passed_pawns, 0)
+
+    def test_passed_pawn_bonus_grows(self):
+        entry = pawn_entry('4k3/8/1P6/8/8/8/8/4K3 w - - 0 1')
+        self.assertEqual(entry.white_passed_pawns,
+                         1 << algebraic_to_index('b6'))
+        self.assertEqual(entry.endgame_score,
+                         PASSED_PAWN_BONUSES[4][1] -
+                         ISOLATED_PAWN_PENALTY[1])
+        black_entry = pawn_entry('4k3/8/8/8/8/1p6/8/4K3 w - - 0 1')
+        self.assertEqual(black_entry.endgame_score, -entry.endgame_score)
+
+    def test_incremental_pawn_key(self):
+        random_generator = random.Random(2023)
+        board = Board()
+        for _ in range(80):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(random_generator.choice(moves))
+            self.assertEqual(board.pawn_key, board.compute_pawn_key())
+        while board.move_history:
+            board.unmake_move()
+        self.assertEqual(board.pawn_key, Board().pawn_key)
+
+    def test_pawn_hash_table(self):
+        table = PawnHashTable(16)
+        board = Board()
+        entry = table.lookup(board)
+        self.assertEqual(table.lookup(board), entry)
+        self.assertEqual(table.return_stats(), (1, 1))
+        self.assertEqual(len(table._keys), table.entry_count)
+        self.assertLessEqual(table.entry_count*40, 16*1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
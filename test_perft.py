@@ -0,0 +1,42 @@
+"""
+Created on Sun Oct 18 21:40:05 2026
+
+@author: danielb
+"""
+
+import unittest
+from board import Board
+from perft import PERFT_POSITIONS, divide, perft, run_perft
+
+
+class PerftTestCase(unittest.TestCase):
+    """Tests the move generators against the known perft node counts"""
+    def test_positions_with_piece_generator(self):
+        for position in PERFT_POSITIONS:
+            result = run_perft(position, 2, 'pieces')
+            self.assertEqual(result.nodes, result.expected_nodes,
+                             position.name)
+
+    def test_positions_with_bitboard_generator(self):
+        for position in PERFT_POSITIONS:
+            result = run_perft(position, 2, 'bitboard')
+            self.assertEqual(result.nodes, result.expected_nodes,
+                             position.name)
+
+    def test_starting_position_depth_three(self):
+        self.assertEqual(perft(Board(), 3), 8902)
+
+    def test_divide_adds_up_to_perft(self):
+        board = Board(fen=PERFT_POSITIONS[1].fen)
+        node_counts = divide(board, 2)
+        self.assertEqual(len(node_counts), 48)
+        self.assertEqual(sum(node_counts.values()), 2039)
+
+    def test_fen_round_trip(self):
+        for position in PERFT_POSITIONS:
+            board = Board(fen=position.fen)
+            self.assertEqual(board.return_fen(), position.fen)
+
+
+if __name__ == '__main__':
+    unittest.main()
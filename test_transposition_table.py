@@ -0,0 +1,89 @@
+"""
+Created on Sun Oct 18 22:41:52 2026
+
+@author: danielb
+"""
+
+import unittest
+from board import Move
+from transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND, \
+    TranspositionTable, decode_move, encode_move
+
+
+class TranspositionTableTestCase(unittest.TestCase):
+    """Tests storing, probing and replacing transposition table entries"""
+    def setUp(self):
+        self.table = TranspositionTable(1)
+
+    def colliding_keys(self, count):
+        """Returns different keys that all map to the first bucket"""
+        return [(index + 1)*self.table.bucket_count for index in range(count)]
+
+    def test_move_encoding(self):
+        for move in (Move(12, 28), Move(52, 60, 'Queen'),
+                     Move(9, 0, 'Knight'), Move(63, 0)):
+            self.assertEqual(decode_move(encode_move(move)), move)
+        self.assertEqual(encode_move(None), 0)
+        self.assertIsNone(decode_move(0))
+
+    def test_store_and_probe(self):
+        self.table.store(12345, 4, -250, LOWER_BOUND, Move(12, 28))
+        entry = self.table.probe(12345)
+        self.assertEqual((entry.depth, entry.score, entry.bound, entry.move),
+                         (4, -250, LOWER_BOUND, Move(12, 28)))
+        self.assertIsNone(self.table.probe(54321))
+        self.assertEqual(self.table.hits, 1)
+        self.assertEqual(self.table.misses, 1)
+
+    def test_store_keeps_old_move_without_new_one(self):
+        self.table.store(99, 2, 10, EXACT, Move(1, 18))
+        self.table.store(99, 3, 5, UPPER_BOUND)
+        self.assertEqual(self.table.probe(99).move, Move(1, 18))
+
+    def test_depth_preferred_replacement(self):
+        deep, shallow, newer = self.colliding_keys(3)
+        self.table.store(deep, 8, 1, EXACT)
+        self.table.store(shallow, 2, 2, EXACT)
+        self.table.store(newer, 3, 3, EXACT)
+        # The deep entry survives and the always-replace slot takes the
+        # most recent shallow entry
+        self.assertEqual(self.table.probe(deep).depth, 8)
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertEqual(self.table.probe(newer).depth, 3)
+        self.assertEqual(self.table.collisions, 1)
+
+    def test_old_searches_are_replaced(self):
+        deep, shallow = self.colliding_keys(2)
+        self.table.store(deep, 8, 1, EXACT)
+        self.table.new_search()
+        self.table.store(shallow, 1, 2, EXACT)
+        self.assertEqual(self.table.probe(shallow).depth, 1)
+        self.assertEqual(self.table.probe(deep).depth, 8)
+
+    def test_memory_stays_fixed(self):
+        slot_count = len(self.table._keys)
+        for key in range(1, 100000):
+            self.table.store(key*2654435761 % (1 << 64), key % 20, key,
+                             EXACT)
+        self.assertEqual(len(self.table._keys), slot_count)
+        self.assertEqual(len(self.table._data), slot_count)
+        self.assertLessEqual(slot_count*16, 1024*1024)
+        self.table.clear()
+        self.assertEqual(self.table.hash_full(), 0)
+
+    def test_clear_empties_written_slots(self):
+        keys = self.colliding_keys(3) + [12345]
+        for key in keys:
+            self.table.store(key, 4, 1, EXACT, Move(12, 28))
+        keys_array = self.table._keys
+        self.table.clear()
+        # A nearly empty table is cleared in place
+        self.assertIs(self.table._keys, keys_array)
+        self.assertFalse(any(self.table._keys))
+        self.assertFalse(any(self.table._data))
+        for key in keys:
+            self.assertIsNone(self.table.probe(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Created on Mon Oct 19 05:31:09 2026
+
+@author: danielb
+"""
+
+import io
+import time
+import unittest
+from engine import SearchLimits
+from helpful_test_functions import MATE_IN_ONE_FEN, wait_for_output
+from uci import UciEngine, parse_limits, parse_position
+
+
+class UciTestCase(unittest.TestCase):
+    """Tests the UCI commands"""
+    def setUp(self):
+        self.output = io.StringIO()
+        self.uci_engine = UciEngine(io.StringIO(), self.output)
+
+    def tearDown(self):
+        self.uci_engine._worker.cancel()
+
+    def test_parse_position(self):
+        board = parse_position(['startpos', 'moves', 'e2e4', 'e7e5', 'g1f3'])
+        self.assertEqual(board.return_fen(), 'rnbqkbnr/pppp1ppp/8/4p3/4P3/'
+                         '5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2')
+        board = parse_position(['fen'] + MATE_IN_ONE_FEN.split())
+        self.assertEqual(board.return_fen(), MATE_IN_ONE_FEN)
+
+    def test_illegal_moves_are_left_off(self):
+        board = parse_position(['startpos', 'moves', 'e2e4', 'e2e4', 'e7e5'])
+        self.assertEqual(len(board.move_history), 1)
+
+    def test_malformed_moves_are_left_off(self):
+        for move_text in ('0000', 'e2e9', 'e2', 'e7e8x'):
+            board = parse_position(['startpos', 'moves', 'e2e4', move_text,
+                                    'e7e5'])
+            self.assertEqual(len(board.move_history), 1)
+        self.uci_engine.handle_command('position startpos moves 0000')
+        self.uci_engine.handle_command('isready')
+        self.assertEqual(self.output.getvalue(), 'readyok\n')
+
+    def test_malformed_fen_keeps_position(self):
+        self.uci_engine.handle_command('position fen ' + MATE_IN_ONE_FEN)
+        self.uci_engine.handle_command('position fen 8/8/x w - - 0 1')
+        self.assertEqual(self.uci_engine._board.return_fen(),
+                         MATE_IN_ONE_FEN)
+
+    def test_parse_limits(self):
+        self.assertEqual(parse_limits(['depth', '5'], 'White'),
+                         (SearchLimits(depth=5), False))
+        limits, infinite = parse_limits(['movetime', '1000'], 'Black')
+        self.assertAlmostEqual(limits.time, 0.95)
+        limits, infinite = parse_limits(['wtime', '60000', 'btime', '3000',
+                                         'movestogo', '10'], 'Black')
+        self.assertAlmostEqual(limits.time, 0.25)
+        self.assertEqual(parse_limits(['infinite'], 'White'),
+                         (SearchLimits(), True))
+
+    def test_uci_and_isready(self):
+        self.uci_engine.handle_command('uci')
+        self.uci_engine.handle_command('isready')
+        lines = self.output.getvalue().splitlines()
+        self.assertEqual(lines[0], 'id name chess-project')
+        self.assertIn('option name Hash type spin default 16 min 1 max 1024',
+                      lines)
+        self.assertEqual(lines[-2:], ['uciok', 'readyok'])
+
+    def test_go_streams_info_and_best_move(self):
+        self.uci_engine.handle_command('position fen ' + MATE_IN_ONE_FEN)
+        self.uci_engine.handle_command('go depth 3')
+        wait_for_output(self.uci_engine, self.output, 'bestmove')
+        lines = self.output.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('info depth 1 score mate 1'))
+        self.assertEqual(lines[-1], 'bestmove a1a8')
+
+    def test_stop_infinite_search(self):
+        self.uci_engine.handle_command('position startpos')
+        self.uci_engine.handle_command('go infinite')
+        time.sleep(0.2)
+        self.uci_engine.report_search()
+        self.assertNotIn('bestmove', self.output.getvalue())
+        self.uci_engine.handle_command('isready')
+        self.assertIn('readyok', self.output.getvalue())
+        self.uci_engine.handle_command('stop')
+        wait_for_output(self.uci_engine, self.output, 'bestmove')
+
+    def test_setoption(self):
+        default_buckets = \
+            self.uci_engine._worker.engine.transposition_table.bucket_count
+        self.uci_engine.handle_command('setoption name Hash value 1')
+        self.assertEqual(
+            self.uci_engine._worker.engine.transposition_table.bucket_count,
+            default_buckets//16)
+        self.uci_engine.handle_command('setoption name NullMove value false')
+        self.assertFalse(self.uci_engine._worker.engine.features.null_move)
+
+    def test_malformed_hash_value_is_ignored(self):
+        worker = self.uci_engine._worker
+        self.uci_engine.handle_command('setoption name Hash value abc')
+        self.uci_engine.handle_command('setoption name Hash')
+        self.assertIs(self.uci_engine._worker, worker)
+        self.uci_engine.handle_command('isready')
+        self.assertEqual(self.output.getvalue(), 'readyok\n')
+
+    def test_run_until_quit(self):
+        output = io.StringIO()
+        uci_engine = UciEngine(io.StringIO('uci\nisready\nquit\ngo\n'),
+                               output)
+        uci_engine.run()
+        self.assertEqual(output.getvalue().splitlines()[-1], 'readyok')
+
+    def test_search_finishes_when_input_ends(self):
+        for go_command in ('go depth 3', 'go infinite'):
+            output = io.StringIO()
+            uci_engine = UciEngine(io.StringIO(f'position fen '
+                                               f'{MATE_IN_ONE_FEN}\n'
+                                               f'{go_command}\n'), output)
+            uci_engine.run()
+            self.assertEqual(output.getvalue().splitlines()[-1],
+                             'bestmove a1a8')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Fixed size transposition table for caching search results
+
+Created on Sun Oct 18 22:20:16 2026
+
+@author: danielb
+"""
+
+from array import array
+from collections import namedtuple
+from board import Move
+
+BISHOP = 'Bishop'
+KNIGHT = 'Knight'
+QUEEN = 'Queen'
+ROOK = 'Rook'
+
+# Bound types for the stored scores
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Each bucket holds a depth-preferred slot and an always-replace slot and
+# each slot is a 64 bit key plus 64 bits of packed data
+SLOTS_PER_BUCKET = 2
+SLOT_BYTES = 16
+
+# Packed data layout: move (16 bits), depth (8 bits), bound (2 bits),
+# search generation (6 bits) and score (32 bits)
+_DEPTH_SHIFT = 16
+_BOUND_SHIFT = 24
+_GENERATION_SHIFT = 26
+_SCORE_SHIFT = 32
+_SCORE_OFFSET = 1 << 31
+_MAX_DEPTH = 255
+_GENERATIONS = 64
+
+_PROMOTION_CODES = {None: 0, KNIGHT: 1, BISHOP: 2, ROOK: 3, QUEEN: 4}
+_PROMOTION_TYPES = (None, KNIGHT, BISHOP, ROOK, QUEEN)
+
+TranspositionEntry = namedtuple('TranspositionEntry',
+                                'key depth score bound move')
+TranspositionStats = namedtuple('TranspositionStats',
+                                'probes hits misses collisions stores')
+
+
+def encode_move(move):
+    """Packs a move into 16 bits, with 0 meaning no move"""
+    if move is None:
+        return 0
+    return move.start | (move.end << 6) | \
+        (_PROMOTION_CODES[move.promotion] << 12)
+
+
+def decode_move(move_code):
+    """Unpacks a move packed by encode_move (or returns None)"""
+    if not move_code:
+        return None
+    return Move(move_code & 63, (move_code >> 6) & 63,
+                _PROMOTION_TYPES[move_code >> 12])
+
+
+class TranspositionTable():
+    """Class for a transposition table that takes a fixed amount of memory
+    set in megabytes. Entries live in two preallocated arrays so memory use
+    never grows no matter how many positions are stored"""
+    def __init__(self, size_mb=16):
+        # Use the largest power of two number of buckets that fits
+        bucket_count = max(1, size_mb*1024*1024//(SLOTS_PER_BUCKET *
+                                                  SLOT_BYTES))
+        self.bucket_count = 1 << (bucket_count.bit_length() - 1)
+        self._bucket_mask = self.bucket_count - 1
+        slot_count = self.bucket_count*SLOTS_PER_BUCKET
+        self._keys = array('Q', bytes(8*slot_count))
+        self._data = array('Q', bytes(8*slot_count))
+        self._generation = 0
+        # First slots of the buckets written since the table was last
+        # cleared, so a clear only has to empty those
+        self._written_slots = set()
+        # Counters
+        self.probes = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def clear(self):
+        """Empties the table and resets the counters. Only the written
+        buckets are zeroed unless most of the table was used"""
+        slot_count = len(self._keys)
+        if len(self._written_slots)*SLOTS_PER_BUCKET*2 > slot_count:
+            self._keys = array('Q', bytes(8*slot_count))
+            self._data = array('Q', bytes(8*slot_count))
+        else:
+            keys = self._keys
+            data = self._data
+            for slot in self._written_slots:
+                keys[slot] = keys[slot + 1] = 0
+                data[slot] = data[slot + 1] = 0
+        self._written_slots.clear()
+        self._generation = 0
+        self.probes = self.hits = self.misses = 0
+        self.collisions = self.stores = 0
+
+    def new_search(self):
+        """Starts a new search so entries from older searches are replaced
+        first"""
+        self._generation = (self._generation + 1) % _GENERATIONS
+
+    def return_stats(self):
+        """Returns the probe, hit, miss, collision and store counters"""
+        return TranspositionStats(self.probes, self.hits, self.misses,
+                                  self.collisions, self.stores)
+
+    def hash_full(self):
+        """Returns how full the table is in permille from a sample of the
+        first thousand slots"""
+        sample = min(1000, len(self._keys))
+        used = sum(1 for index in range(sample) if self._keys[index])
+        return used*1000//sample
+
+    def probe(self, key):
+        """Returns the entry stored for the Zobrist key (or None)"""
+        self.probes += 1
+        slot = (key & self._bucket_mask)*SLOTS_PER_BUCKET
+        for index in (slot, slot + 1):
+            if self._keys[index] == key:
+                self.hits += 1
+                return self._unpack(key, self._data[index])
+        self.misses += 1
+        if self._keys[slot] or self._keys[slot + 1]:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        """Stores a search result. The first slot of the bucket keeps the
+        deepest result of the current search and the second slot always
+        takes whatever the first slot doesn't"""
+        self.stores += 1
+        slot = (key & self._bucket_mask)*SLOTS_PER_BUCKET
+        self._written_slots.add(slot)
+        depth = min(max(depth, 0), _MAX_DEPTH)
+        keys = self._keys
+        data = self._data
+        preferred_key = keys[slot]
+        preferred_data = data[slot]
+
+        # Keep the best move already known for the position if there isn't
+        # a new one
+        if not move:
+            for index in (slot, slot + 1):
+                if keys[index] == key:
+                    move_code = data[index] & 0xFFFF
+                    break
+            else:
+                move_code = 0
+        else:
+            move_code = encode_move(move)
+        packed = move_code | (depth << _DEPTH_SHIFT) | \
+            (bound << _BOUND_SHIFT) | \
+            (self._generation << _GENERATION_SHIFT) | \
+            ((score + _SCORE_OFFSET) << _SCORE_SHIFT)
+
+        preferred_depth = (preferred_data >> _DEPTH_SHIFT) & 0xFF
+        preferred_generation = (preferred_data >> _GENERATION_SHIFT) & 0x3F
+        if not preferred_key or preferred_key == key or \
+                depth >= preferred_depth or \
+                preferred_generation != self._generation:
+            # Move a different position down to the always-replace slot
+            # rather than losing it
+            if preferred_key and preferred_key != key:
+                keys[slot + 1] = preferred_key
+                data[slot + 1] = preferred_data
+            elif keys[slot + 1] == key:
+                keys[slot + 1] = 0
+                data[slot + 1] = 0
+            keys[slot] = key
+            data[slot] = packed
+        else:
+            keys[slot + 1] = key
+            data[slot + 1] = packed
+
+    @staticmethod
+    def _unpack(key, packed):
+        """Unpacks the data of a slot into an entry"""
+        return TranspositionEntry(key,
+                                  (packed >> _DEPTH_SHIFT) & 0xFF,
+                                  (packed >> _SCORE_SHIFT) - _SCORE_OFFSET,
+                                  (packed >> _BOUND_SHIFT) & 0x3,
+                                  decode_move(packed & 0xFFFF))
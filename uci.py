@@ -0,0 +1,282 @@
+"""
+Universal Chess Interface (UCI) protocol over stdin and stdout
+
+Created on Mon Oct 19 05:03:26 2026
+
+@author: danielb
+"""
+
+import logging
+import queue
+import sys
+import threading
+import time
+from board import Board, Move, STARTING_FEN
+from engine import SearchFeatures, SearchLimits, score_to_text
+from engine_worker import BEST_MOVE, INFO, EngineWorker
+from helpful_functions import move_to_text, text_to_squares
+
+ENGINE_NAME = 'chess-project'
+ENGINE_AUTHOR = 'danielb'
+DEFAULT_HASH_MB = 16
+MAX_HASH_MB = 1024
+# How long to wait for a command before checking for search progress
+POLL_INTERVAL = 0.01
+# With a clock and no moves to go, the time left is shared out as if this
+# many moves are left. A little is always kept back for the reply to travel
+DEFAULT_MOVES_TO_GO = 30
+MOVE_OVERHEAD = 0.05
+
+# The check options that switch the search features on and off
+FEATURE_OPTIONS = {
+    'NullMove': 'null_move',
+    'LateMoveReductions': 'late_move_reductions',
+    'FutilityPruning': 'futility_pruning',
+    'Razoring': 'razoring'
+    }
+
+
+def parse_position(arguments):
+    """Returns a board set up from the arguments of a position command,
+    'startpos' or 'fen <fen>' followed by an optional 'moves <moves>'. Moves
+    from the first malformed or illegal one on are left off"""
+    if 'moves' in arguments:
+        moves_index = arguments.index('moves')
+        move_texts = arguments[moves_index + 1:]
+        arguments = arguments[:moves_index]
+    else:
+        move_texts = []
+    if arguments[:1] == ['fen']:
+        board = Board(fen=' '.join(arguments[1:]))
+    else:
+        board = Board(fen=STARTING_FEN)
+    for move_text in move_texts:
+        try:
+            move = Move(*text_to_squares(move_text))
+        except (KeyError, IndexError):
+            move = None
+        if move not in board.legal_moves():
+            logging.warning(f'Ignoring the move {move_text} and the moves '
+                            f'after it as it is malformed or illegal')
+            break
+        board.make_move(move)
+    return board
+
+
+def parse_limits(arguments, turn_color):
+    """Returns the search limits and whether the search is infinite from the
+    arguments of a go command"""
+    values = {}
+    for name, value in zip(arguments, arguments[1:]):
+        if value.lstrip('-').isdigit():
+            values[name] = int(value)
+    infinite = 'infinite' in arguments or 'ponder' in arguments
+    seconds = None
+    if 'movetime' in values:
+        seconds = values['movetime']/1000
+    else:
+        if turn_color == 'White':
+            time_left, increment = values.get('wtime'), values.get('winc', 0)
+        else:
+            time_left, increment = values.get('btime'), values.get('binc', 0)
+        if time_left is not None and not infinite:
+            moves_to_go = values.get('movestogo') or DEFAULT_MOVES_TO_GO
+            seconds = min(time_left/moves_to_go + increment*3/4,
+                          time_left/2)/1000
+    if seconds is not None:
+        seconds = max(seconds - MOVE_OVERHEAD, 0.01)
+    return SearchLimits(values.get('depth'), values.get('nodes'),
+                        seconds), infinite
+
+
+class UciEngine():
+    """Class that speaks the UCI protocol. A reader thread queues the
+    commands as they arrive and the search runs on an engine worker, so
+    commands like stop and isready are answered while the engine thinks.
+    Every completed iteration is sent as an info line"""
+    def __init__(self, input_stream=None, output_stream=None):
+        # Instance variables
+        self._input_stream = input_stream or sys.stdin
+        self._output_stream = output_stream or sys.stdout
+        self._commands = queue.Queue()
+        self._board = Board()
+        self._hash_size_mb = DEFAULT_HASH_MB
+        self._features = SearchFeatures()
+        self._worker = EngineWorker(self._hash_size_mb, self._features)
+        self._infinite = False
+        self._held_result = None
+        self._handlers = {
+            'uci': self._uci,
+            'isready': self._isready,
+            'setoption': self._setoption,
+            'ucinewgame': self._ucinewgame,
+            'position': self._position,
+            'go': self._go,
+            'stop': self._stop
+            }
+
+    def run(self):
+        """Answers commands until quit is sent or the input ends. A search
+        still running when the input ends is finished and its best move
+        sent"""
+        threading.Thread(target=self._read_commands, name='uci-reader',
+                         daemon=True).start()
+        while True:
+            try:
+                line = self._commands.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                line = ''
+            self.report_search()
+            if line is None:
+                self.finish_search()
+                break
+            if not self.handle_command(line):
+                break
+        self._worker.cancel()
+
+    def finish_search(self):
+        """Waits for the running search to send its best move, stopping it
+        first if it is infinite"""
+        if self._infinite:
+            self._stop([])
+        while self._worker.is_searching():
+            time.sleep(POLL_INTERVAL)
+            self.report_search()
+        self.report_search()
+
+    def _read_commands(self):
+        """Queues every line of input, then None once the input ends"""
+        for line in self._input_stream:
+            self._commands.put(line)
+        self._commands.put(None)
+
+    def handle_command(self, line):
+        """Carries out one command. Returns False if it was quit"""
+        words = line.split()
+        if not words:
+            return True
+        command, arguments = words[0], words[1:]
+        if command == 'quit':
+            return False
+        if command in self._handlers:
+            self._handlers[command](arguments)
+        else:
+            logging.warning(f'Unknown UCI command: {line.strip()}')
+        return True
+
+    def report_search(self):
+        """Sends an info line for every iteration the search has finished
+        since the last report and the best move once it is done"""
+        for message in self._worker.poll():
+            result = message.result
+            if message.kind == INFO:
+                principal_variation = ' '.join(
+                    map(move_to_text, result.principal_variation))
+                self._send(f'info depth {result.depth} score '
+                           f'{score_to_text(result.score)} nodes '
+                           f'{result.nodes} nps '
+                           f'{result.nodes_per_second:.0f} time '
+                           f'{int(result.seconds*1000)} pv '
+                           f'{principal_variation}')
+            elif message.kind == BEST_MOVE:
+                # An infinite search only reports its move once stopped
+                if self._infinite:
+                    self._held_result = result
+                else:
+                    self._send_best_move(result)
+
+    def _send(self, text):
+        """Writes one line of output"""
+        self._output_stream.write(text + '\n')
+        self._output_stream.flush()
+
+    def _send_best_move(self, result):
+        """Sends the best move of a finished search"""
+        if result.best_move is None:
+            self._send('bestmove 0000')
+        else:
+            self._send(f'bestmove {move_to_text(result.best_move)}')
+
+    def _uci(self, arguments):
+        """Identifies the engine and lists its options"""
+        self._send(f'id name {ENGINE_NAME}')
+        self._send(f'id author {ENGINE_AUTHOR}')
+        self._send(f'option name Hash type spin default {DEFAULT_HASH_MB} '
+                   f'min 1 max {MAX_HASH_MB}')
+        for name in FEATURE_OPTIONS:
+            self._send(f'option name {name} type check default true')
+        self._send('uciok')
+
+    def _isready(self, arguments):
+        """Answers that the engine is ready, even while it is searching"""
+        self._send('readyok')
+
+    def _setoption(self, arguments):
+        """Sets one of the options from 'name <name> value <value>'"""
+        if 'name' not in arguments:
+            return
+        if 'value' in arguments:
+            value_index = arguments.index('value')
+            value = ' '.join(arguments[value_index + 1:])
+        else:
+            value_index = len(arguments)
+            value = ''
+        name = ' '.join(arguments[arguments.index('name') + 1:value_index])
+        if name == 'Hash':
+            if not value.isdigit():
+                logging.warning(f'Ignoring the Hash value {value!r}, it '
+                                f'should be a number of MB')
+                return
+            self._hash_size_mb = max(1, min(int(value), MAX_HASH_MB))
+            self._worker.cancel()
+            self._worker = EngineWorker(self._hash_size_mb, self._features)
+        elif name in FEATURE_OPTIONS:
+            self._features = self._features._replace(
+                **{FEATURE_OPTIONS[name]: value.lower() == 'true'})
+            self._worker.cancel()
+            self._worker.engine.features = self._features
+        else:
+            logging.warning(f'Unknown UCI option: {name}')
+
+    def _ucinewgame(self, arguments):
+        """Forgets everything learned in the last game"""
+        self._worker.cancel()
+        self._worker.engine.clear()
+
+    def _position(self, arguments):
+        """Sets up the position to search, keeping the last one if the FEN
+        can't be read"""
+        try:
+            self._board = parse_position(arguments)
+        except (ValueError, KeyError, IndexError):
+            logging.warning(f'Ignoring the position with the malformed FEN '
+                            f'{" ".join(arguments)}')
+
+    def _go(self, arguments):
+        """Starts searching the current position in the background"""
+        limits, self._infinite = parse_limits(arguments,
+                                              self._board.turn_color)
+        self._held_result = None
+        self._worker.start(self._board, limits)
+
+    def _stop(self, arguments):
+        """Stops the search, which then sends its best move"""
+        self._worker.stop()
+        if self._infinite:
+            self._infinite = False
+            if self._held_result is not None:
+                self._send_best_move(self._held_result)
+                self._held_result = None
+
+
+def main():
+    """Runs the engine in UCI mode on stdin and stdout"""
+    logging.basicConfig(
+        format='[%(asctime)s] %(levelname)s : %(funcName)s() - %(message)s',
+        level=logging.WARNING)
+    UciEngine().run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Random keys for Zobrist hashing of chess positions
+
+Created on Sun Oct 18 21:58:31 2026
+
+@author: danielb
+"""
+
+import random
+
+WHITE = 'White'
+BLACK = 'Black'
+BISHOP = 'Bishop'
+KING = 'King'
+KNIGHT = 'Knight'
+PAWN = 'Pawn'
+QUEEN = 'Queen'
+ROOK = 'Rook'
+
+# A fixed seed keeps the keys (and so any saved hashes) the same every run
+_random_generator = random.Random(20181130)
+
+
+def _random_key():
+    """Returns a random 64 bit key"""
+    return _random_generator.getrandbits(64)
+
+
+# One key for every piece color, piece type and square
+PIECE_KEYS = {
+    color: {piece_type: tuple(_random_key() for _ in range(64))
+            for piece_type in (BISHOP, KING, KNIGHT, PAWN, QUEEN, ROOK)}
+    for color in (WHITE, BLACK)
+    }
+# Key mixed in when black is to move
+BLACK_TO_MOVE_KEY = _random_key()
+# One key for each combination of the four castling right flags
+CASTLING_KEYS = tuple(_random_key() for _ in range(16))
+# One key for each column the en passant square can be on
+EN_PASSANT_KEYS = tuple(_random_key() for _ in range(8))